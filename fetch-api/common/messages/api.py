@@ -2,6 +2,9 @@ client_responses = {
     'server-error': {
         'error': 'An internal server error occurred.'
     },
+    'server-busy': {
+        'error': 'The server is busy, please try again later.'
+    },
     'upstream-error': {
         'error': 'An internal server error occured with the upstream connector while fetching data.'
     }
@@ -0,0 +1,36 @@
+import atexit
+from opentelemetry import metrics
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+
+
+
+class Meter:
+    def __init__(self, otel_meta: dict) -> None:
+        self.resource = Resource.create({
+            'service.name': otel_meta['service_name'],
+            'service.namespace': otel_meta['service_namespace'],
+            'service.version': otel_meta['service_version']
+        })
+        self.metric_exporter = OTLPMetricExporter(
+            endpoint = otel_meta['otlp_endpoint_grpc'],
+            insecure = True
+        )
+
+        self.provider = MeterProvider(
+            resource=self.resource,
+            metric_readers=[
+                PeriodicExportingMetricReader(self.metric_exporter)
+            ]
+        )
+
+        metrics.set_meter_provider(self.provider)
+        self.meter = metrics.get_meter(otel_meta['service_name'])
+
+        atexit.register(lambda: self.provider.shutdown())
+
+
+    def get_meter(self) -> metrics.Meter:
+        return self.meter
@@ -22,6 +22,10 @@ def reword(attributes: dict) -> dict:
     discarded_keys = []
 
     for a_k, a_v in reworded.items():
+        if isinstance(a_v, bytes):
+            a_v = a_v.decode(errors='replace')
+            reworded[a_k] = a_v
+
         if isinstance(a_v, (list, dict)) and len(a_v) == 0:
             discarded_keys.append(a_k)
             continue
@@ -0,0 +1,80 @@
+import threading, contextvars
+from typing import Any, Callable
+from concurrent.futures import Executor, Future
+
+
+
+def submit_with_context(executor: Executor, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    context = contextvars.copy_context()
+
+    return executor.submit(context.run, func, *args, **kwargs)
+
+
+
+class SingleFlight:
+    class Call:
+        def __init__(self) -> None:
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+            self.waiters = 0
+
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls = {}
+
+
+    def claim(self, key: Any) -> tuple['SingleFlight.Call', bool]:
+        with self.lock:
+            call = self.calls.get(key)
+
+            if not call is None:
+                call.waiters += 1
+                return call, False
+
+            call = SingleFlight.Call()
+            self.calls[key] = call
+
+            return call, True
+
+
+    def resolve(self, key: Any, result: Any = None, error: Exception | None = None) -> None:
+        with self.lock:
+            call = self.calls.pop(key, None)
+
+        if call is None:
+            return None
+
+        call.result = result
+        call.error = error
+        call.event.set()
+
+
+    @staticmethod
+    def wait(call: 'SingleFlight.Call', timeout: float | None = None) -> Any:
+        if not call.event.wait(timeout):
+            raise TimeoutError(f'Shared call did not complete within {timeout}s')
+
+        if not call.error is None:
+            raise call.error
+
+        return call.result
+
+
+    def do(self, key: Any, func: Callable[..., Any], *args: Any, wait_timeout: float | None = None, **kwargs: Any) -> tuple[Any, bool, int]:
+        call, owner = self.claim(key)
+
+        if not owner:
+            return SingleFlight.wait(call, timeout=wait_timeout), True, call.waiters
+
+        try:
+            result = func(*args, **kwargs)
+
+        except Exception as err:
+            self.resolve(key, error=err)
+            raise
+
+        self.resolve(key, result=result)
+
+        return result, False, call.waiters
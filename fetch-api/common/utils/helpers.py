@@ -1,7 +1,8 @@
 from typing import Any
+from functools import lru_cache
 from datetime import datetime, timezone
 from common.utils.system import read_file
-import re, zoneinfo, json, hashlib
+import zoneinfo, json, hashlib
 
 
 
@@ -39,72 +40,78 @@ class SysUtils:
 
 
 class TimeUtils:
+    months = tuple(datetime(2000, month, 1).strftime('%B') for month in range(1, 13))
+
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def get_tz(target_tz: str = 'Europe/Sofia') -> zoneinfo.ZoneInfo:
+        return zoneinfo.ZoneInfo(target_tz)
+
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def parse_iso(dt_string: str, target_tz: str = 'Europe/Sofia') -> datetime:
+        dt = datetime.fromisoformat(dt_string)
+
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=TimeUtils.get_tz(target_tz))
+
+        return dt
+
+
+    @staticmethod
+    def format_iso(dt: datetime) -> str:
+        return f'{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}'
+
+
     @staticmethod
     def time_beautify_ms(milliseconds: int, target_tz: str = 'Europe/Sofia', convert_tz: bool = True) -> str:
-        seconds = milliseconds / 1000
-        tz = zoneinfo.ZoneInfo(target_tz)
-        
-        dt_utc = datetime.fromtimestamp(seconds, tz=timezone.utc)
+        dt = datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc)
 
         if convert_tz:
-            dt = dt_utc.astimezone(tz)
-        else:
-            dt = dt_utc
+            dt = dt.astimezone(TimeUtils.get_tz(target_tz))
 
-        return dt.strftime('%Y-%m-%dT%H:%M:%S')
+        return TimeUtils.format_iso(dt)
 
 
     @staticmethod
     def time_beautify_ordinal(dt_string: str, target_tz: str = 'Europe/Sofia') -> str:
-        def get_ordinal_day(n: int) -> str:
-            if 10 <= n % 100 <= 20:
-                suffix = 'th'
-            else:
-                suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
-            return f'{n}{suffix}'
-        
-        tz = zoneinfo.ZoneInfo(target_tz)
-        dt = datetime.fromisoformat(dt_string)
+        return TimeUtils.time_ordinal(TimeUtils.parse_iso(dt_string, target_tz))
 
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=tz)
 
-        day = get_ordinal_day(dt.day)
-        month = dt.strftime('%B')
-        year = dt.year
-        time = dt.strftime('%H:%M')
+    @staticmethod
+    def time_ordinal(dt: datetime) -> str:
+        if 10 <= dt.day % 100 <= 20:
+            suffix = 'th'
+        else:
+            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(dt.day % 10, 'th')
 
-        return f'{year} / {day} of {month} at {time}'
+        return f'{dt.year} / {dt.day}{suffix} of {TimeUtils.months[dt.month - 1]} at {dt.hour:02d}:{dt.minute:02d}'
 
 
     @staticmethod
     def time_now(target_tz: str = 'Europe/Sofia') -> str:
-        tz = zoneinfo.ZoneInfo(target_tz)
-        now = datetime.now(tz)
-
-        return now.strftime('%Y-%m-%dT%H:%M:%S')
+        return TimeUtils.format_iso(datetime.now(TimeUtils.get_tz(target_tz)))
 
 
     @staticmethod
     def time_since(past: str, future: str | None = None, tz: str = 'Europe/Sofia', instant: bool = True) -> str:
-        tz = zoneinfo.ZoneInfo(tz)
-        past_dt = datetime.fromisoformat(past)
+        past_dt = TimeUtils.parse_iso(past, tz)
 
-        if past_dt.tzinfo is None:
-            past_dt = past_dt.replace(tzinfo=tz)
-        
         if future is None:
-            future_dt = datetime.now(tz)
-        
-        else:
-            future_dt = datetime.fromisoformat(future)
+            future_dt = datetime.now(TimeUtils.get_tz(tz))
 
-            if future_dt.tzinfo is None:
-                future_dt = future_dt.replace(tzinfo=tz)
+        else:
+            future_dt = TimeUtils.parse_iso(future, tz)
 
         diff = future_dt - past_dt
-        seconds = diff.total_seconds()
 
+        return TimeUtils.time_since_seconds(diff.total_seconds(), instant)
+
+
+    @staticmethod
+    def time_since_seconds(seconds: float, instant: bool = True) -> str:
         days = int(seconds // 86400)
         hours = int((seconds % 86400) // 3600)
         minutes = int((seconds % 3600) // 60)
@@ -155,6 +162,52 @@ class TimeUtils:
 
 
 
+class Timestamps:
+    def __init__(self, values: list, target_tz: str = 'Europe/Sofia') -> None:
+        self.tz = TimeUtils.get_tz(target_tz)
+
+        self.utc = [
+            datetime.fromtimestamp(value // 1000, tz=timezone.utc) if isinstance(value, (int, float)) else None
+            for value in values
+        ]
+        self.local = [
+            None if dt is None else dt.astimezone(self.tz)
+            for dt in self.utc
+        ]
+
+
+    def iso_local(self, default: Any = 'N/A') -> list:
+        return [default if dt is None else TimeUtils.format_iso(dt) for dt in self.local]
+
+
+    def iso_utc(self, default: Any = None) -> list:
+        return [default if dt is None else TimeUtils.format_iso(dt) for dt in self.utc]
+
+
+    def ordinal(self, default: Any = None) -> list:
+        return [default if dt is None else TimeUtils.time_ordinal(dt) for dt in self.local]
+
+
+    def since(self, until: 'Timestamps', instant: bool = False, default: Any = None) -> list:
+        return [
+            default if (start is None or end is None) else TimeUtils.time_since_seconds(
+                (end - start).total_seconds(),
+                instant
+            )
+            for start, end in zip(self.local, until.local)
+        ]
+
+
+    def since_now(self, instant: bool = True, default: Any = None) -> list:
+        now = datetime.now(self.tz)
+
+        return [
+            default if dt is None else TimeUtils.time_since_seconds((now - dt).total_seconds(), instant)
+            for dt in self.local
+        ]
+
+
+
 class DataUtils:
     @staticmethod
     def get_maps_url(path: str) -> str:
@@ -208,35 +261,26 @@ class DataUtils:
 
 
     @staticmethod
-    def omit_volatile_data(data: Any) -> Any:
-        VOLATILE_PATTERN = re.compile(
-            r'^('
-            r'(<\d+m)'
-            r'|(\d+d\d+h(\d+m)?)'
-            r'|(\d+h\d+m)'
-            r'|(\d+m)'
-            r'|(\d+h)'
-            r'|(just now)'
-            r')$',
-            re.IGNORECASE
-        )
+    def fill_volatile_data(items: list, volatile_fields: list[dict]) -> list:
+        if len(volatile_fields) == 0:
+            return items
 
-        if isinstance(data, dict):
-            return {
-                k: DataUtils.omit_volatile_data(v)
-                for k, v in data.items()
-            }
+        filled_items = []
+
+        for item in items:
+            if not isinstance(item, dict):
+                filled_items.append(item)
+                continue
 
-        if isinstance(data, list):
-            return [
-                DataUtils.omit_volatile_data(item)
-                for item in data
-            ]
+            values = {
+                volatile_field['field']: TimeUtils.time_since(item[volatile_field['since']])
+                for volatile_field in volatile_fields
+                if not item.get(volatile_field['since']) in (None, 'N/A')
+            }
 
-        if isinstance(data, str):
-            return '<volatile>' if VOLATILE_PATTERN.match(data.strip()) else data
+            filled_items.append({**item, **values} if len(values) > 0 else item)
 
-        return data
+        return filled_items
 
 
     @staticmethod
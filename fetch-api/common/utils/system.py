@@ -1,8 +1,31 @@
 from typing import Any
+from functools import lru_cache
+from jinja2 import meta
 import os, json, yaml, jinja2
 
 
 
+template_environment = jinja2.Environment(
+    undefined=jinja2.StrictUndefined
+)
+
+
+@jinja2.pass_context
+def bind_filter(context: jinja2.runtime.Context, value: Any) -> Any:
+    bind_params = context.get('bind_params')
+
+    if bind_params is None:
+        return value
+
+    bind_params.append(value)
+
+    return f'${len(bind_params)}'
+
+
+template_environment.filters['bind'] = bind_filter
+
+
+
 def read_file(path: str, type: str = 'json') -> Any:
     readers = {
         'yaml': lambda f: yaml.safe_load(f),
@@ -29,10 +52,15 @@ def read_file(path: str, type: str = 'json') -> Any:
                 return f.read()
 
 
-def render_template(content: str, vars: dict | None = None) -> str:
-    template = jinja2.Template(
-        content,
-        undefined=jinja2.StrictUndefined
+@lru_cache(maxsize=256)
+def compile_template(content: str) -> tuple[jinja2.Template, frozenset]:
+    return (
+        template_environment.from_string(content),
+        frozenset(meta.find_undeclared_variables(template_environment.parse(content)))
     )
 
-    return template.render(vars)
+
+def render_template(content: str, vars: dict | None = None) -> str:
+    template, _ = compile_template(content)
+
+    return template.render(vars or {})
@@ -9,5 +9,6 @@ if __name__ == "__main__":
         app,
         host=settings.listen_host,
         port=settings.listen_port,
+        timeout_keep_alive=settings.listen_keep_alive_seconds,
         log_config=logger.get_uvicorn_config()
     )
@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     name: str = 'connector-grafana'
     listen_host: str = '0.0.0.0'
     listen_port: int = 8080
+    listen_keep_alive_seconds: int = 75
 
     url: str
     sa_token: str
@@ -25,6 +26,11 @@ class Settings(BaseSettings):
 
     auth_endpoint: str | None = None
     authenticated: bool = False
+    auth_last_check: str | None = None
+    auth_job_id: str | None = None
+
+    auth_ttl_seconds: int = 300
+    auth_refresh_interval_seconds: int = 120
 
     health_endpoint: str | None = None
     health_job_id: str | None = None
@@ -39,6 +45,19 @@ class Settings(BaseSettings):
     querier_default_endpoint: str = 'api/ds/query'
     querier_ds_uid_postgresql: str = 'internal-teslamate'
     querier_ds_uid_prometheus: str = 'internal-victoriametrics'
+    querier_requests_timeout_seconds: int = 30
+
+    querier_cache_enabled: bool = True
+    querier_cache_max_items: int = 512
+
+    querier_postgresql_dsn: str | None = None
+    querier_postgresql_pool_min_size: int = 1
+    querier_postgresql_pool_max_size: int = 4
+
+    querier_prometheus_url: str | None = None
+    querier_prometheus_pool_size: int = 4
+
+    querier_direct_max_workers: int = 8
 
 
     def model_post_init(self, __context: Any) -> None:
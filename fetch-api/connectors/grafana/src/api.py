@@ -10,6 +10,7 @@ from connectors.grafana.src.telemetry.tracing import instrumentor
 from connectors.grafana.src.grafana.client import GrafanaClient
 from connectors.grafana.src.health_checker import HealthChecker
 from connectors.grafana.src.loaders import RoutesLoader
+from connectors.grafana.src.executors import direct_executor
 
 
 @asynccontextmanager
@@ -17,12 +18,14 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     scheduler.start()
     health_checker.create_schedule()
     grafana_client.authenticate()
+    grafana_client.create_auth_schedule(scheduler)
 
     RoutesLoader.load(app, settings)
 
     yield
 
     scheduler.shutdown()
+    direct_executor.shutdown(wait=False, cancel_futures=True)
 
 
 scheduler = BackgroundScheduler()
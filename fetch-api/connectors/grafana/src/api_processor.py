@@ -41,3 +41,44 @@ class APIProcessor:
             })
 
             return JSONResponse(content=client_responses['server-error'], status_code=500)
+
+
+    @staticmethod
+    @traced('process batch request')
+    def process_batch_request(
+        queries: list[dict],
+        span=None
+    ) -> JSONResponse:
+        query_ids = [query['query_id'] for query in queries]
+
+        try:
+            result = querier.commit_batch(queries=queries)
+
+            assert not result is None
+
+            failed_query_ids = [
+                query['query_id'] for query in result['queries']
+                if query['status'] == 'failed'
+            ]
+
+            if len(failed_query_ids) > 0:
+                log.warning('Batch query partially failed', extra={
+                    'query_ids': query_ids,
+                    'failed_query_ids': failed_query_ids
+                })
+
+                return JSONResponse(content=result, status_code=207)
+
+            log.info('Batch query executed successfully', extra={
+                'query_ids': query_ids
+            })
+
+            return JSONResponse(content=result, status_code=200)
+
+        except Exception as err:
+            log.error('Batch query execution failed', extra={
+                'query_ids': query_ids,
+                'error': str(err)
+            })
+
+            return JSONResponse(content=client_responses['server-error'], status_code=500)
@@ -0,0 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+from connectors.grafana.settings import settings
+
+
+direct_executor = ThreadPoolExecutor(
+    max_workers=settings.querier_direct_max_workers,
+    thread_name_prefix='direct'
+)
@@ -0,0 +1,138 @@
+import json, time, threading
+from typing import Any, Callable
+from collections import OrderedDict
+from common.utils.concurrency import SingleFlight
+
+
+
+class ResultCache:
+    def __init__(self, max_items: int, wait_timeout: float | None = None) -> None:
+        self.max_items = max_items
+        self.wait_timeout = wait_timeout
+
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.flights = SingleFlight()
+
+
+    @staticmethod
+    def create_key(query_ds_type: str, query_id: str, query_params: dict | None = None) -> tuple:
+        return (
+            query_ds_type,
+            query_id,
+            json.dumps(query_params or {}, sort_keys=True, default=str)
+        )
+
+
+    def get(self, key: tuple) -> Any:
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+
+            if expires_at <= time.monotonic():
+                self.entries.pop(key, None)
+                return None
+
+            self.entries.move_to_end(key)
+
+            return value
+
+
+    def set(self, key: tuple, value: Any, ttl: int) -> None:
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_items:
+                self.entries.popitem(last=False)
+
+
+    def claim(self, key: tuple) -> tuple[SingleFlight.Call, bool]:
+        return self.flights.claim(key)
+
+
+    def resolve(self, key: tuple, result: Any = None, error: Exception | None = None) -> None:
+        self.flights.resolve(key, result=result, error=error)
+
+
+    def wait(self, call: SingleFlight.Call) -> Any:
+        return SingleFlight.wait(call, timeout=self.wait_timeout)
+
+
+    def fetch(self, key: tuple, ttl: int | None, func: Callable[..., tuple[Any, bool]], *args: Any, **kwargs: Any) -> tuple[Any, str]:
+        if not ttl:
+            value, _ = func(*args, **kwargs)
+            return value, 'disabled'
+
+        value = self.get(key)
+
+        if not value is None:
+            return value, 'hit'
+
+        call, owner = self.claim(key)
+
+        if not owner:
+            return self.wait(call), 'shared'
+
+        try:
+            value = self.get(key)
+
+            if not value is None:
+                self.resolve(key, result=value)
+                return value, 'hit'
+
+            value, cacheable = func(*args, **kwargs)
+
+            if cacheable:
+                self.set(key, value, ttl)
+
+        except Exception as err:
+            self.resolve(key, error=err)
+            raise
+
+        self.resolve(key, result=value)
+
+        return value, 'miss'
+
+
+
+class RecordMemo:
+    def __init__(self, max_items: int) -> None:
+        self.max_items = max_items
+
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+
+    def get_many(self, keys: list) -> dict:
+        found = {}
+
+        with self.lock:
+            for key in keys:
+                record = self.entries.get(key)
+
+                if record is None:
+                    continue
+
+                self.entries.move_to_end(key)
+                found[key] = record
+
+        return found
+
+
+    def set_many(self, records: dict) -> None:
+        with self.lock:
+            for key, record in records.items():
+                self.entries[key] = record
+                self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_items:
+                self.entries.popitem(last=False)
+
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -1,5 +1,7 @@
-import requests
+import requests, time
+from datetime import datetime
 from requests import exceptions as ReqExceptions
+from apscheduler.schedulers.background import BackgroundScheduler
 from connectors.grafana.settings import settings
 from common.telemetry.src.tracing.wrappers import traced
 from common.telemetry.src.tracing.helpers import reword
@@ -11,6 +13,7 @@ class GrafanaClient:
     def __init__(self) -> None:
         self.url = settings.url
         self.sa_token = settings.sa_token
+        self.auth_checked_at = None
         self.set_headers()
 
 
@@ -51,7 +54,11 @@ class GrafanaClient:
                 headers=self.headers
             )
 
+            settings.auth_last_check = datetime.now().isoformat().split('.')[0]
+
             if response.status_code == 200:
+                self.auth_checked_at = time.monotonic()
+
                 if not settings.authenticated:
                     log.debug(f'Authentication successful', extra={
                         'auth_endpoint': settings.auth_endpoint
@@ -115,9 +122,73 @@ class GrafanaClient:
             return False
 
 
+    def is_authenticated(self) -> bool:
+        if (
+            settings.authenticated
+            and self.auth_checked_at is not None
+            and (time.monotonic() - self.auth_checked_at) < settings.auth_ttl_seconds
+        ):
+            return True
+
+        return self.authenticate()
+
+
+    @traced('schedule authentication refresh')
+    def create_auth_schedule(self, scheduler: BackgroundScheduler, span=None) -> None:
+        job = scheduler.add_job(
+            self.authenticate,
+            'interval',
+            seconds=settings.auth_refresh_interval_seconds,
+            id='auth_refresh_grafana',
+            replace_existing=True
+        )
+
+        settings.auth_job_id = job.id
+
+        span.set_attributes({
+            'scheduler.interval.seconds': settings.auth_refresh_interval_seconds,
+            'scheduler.job.id': settings.auth_job_id,
+            'grafana.auth.ttl_seconds': settings.auth_ttl_seconds
+        })
+
+
+    def request(self, method: str, endpoint: str, data: dict | bytes, span=None) -> requests.Response:
+        body = {'data': data} if isinstance(data, bytes) else {'json': data}
+
+        response = requests.request(
+            method,
+            f'{self.url}/{endpoint}',
+            headers=self.headers,
+            timeout=settings.querier_requests_timeout_seconds,
+            **body
+        )
+
+        if response.status_code in (401, 403):
+            log.warning('Request rejected by Grafana, re-validating authentication', extra={
+                'endpoint': endpoint,
+                'response_status_code': response.status_code
+            })
+            span.add_event('re-authentication required', attributes={
+                'grafana.response.status_code': response.status_code
+            })
+
+            settings.authenticated = False
+
+            if self.authenticate():
+                response = requests.request(
+                    method,
+                    f'{self.url}/{endpoint}',
+                    headers=self.headers,
+                    timeout=settings.querier_requests_timeout_seconds,
+                    **body
+                )
+
+        return response
+
+
     @traced('GET /:grafana')
-    def get(self, endpoint: str, data: dict = {}, span=None) -> requests.Response | None:
-        if self.authenticate():
+    def get(self, endpoint: str, data: dict | bytes = {}, span=None) -> requests.Response | None:
+        if self.is_authenticated():
             span.set_attributes(
                 reword({
                     'grafana.operation': 'get_request',
@@ -129,13 +200,7 @@ class GrafanaClient:
                 })
             )
 
-            response = requests.get(
-                f'{self.url}/{endpoint}',
-                headers=self.headers,
-                json=data
-            )
-
-            return response
+            return self.request('GET', endpoint, data, span=span)
         
         else:
             span.set_attributes(
@@ -146,8 +211,8 @@ class GrafanaClient:
 
 
     @traced('POST /:grafana')
-    def post(self, endpoint: str, data: dict = {}, span=None) -> requests.Response | None:
-        if self.authenticate():
+    def post(self, endpoint: str, data: dict | bytes = {}, span=None) -> requests.Response | None:
+        if self.is_authenticated():
             span.set_attributes(
                 reword({
                     'grafana.operation': 'post_request',
@@ -159,13 +224,7 @@ class GrafanaClient:
                 })
             )
 
-            response = requests.post(
-                f'{self.url}/{endpoint}',
-                headers=self.headers,
-                json=data
-            )
-
-            return response
+            return self.request('POST', endpoint, data, span=span)
 
         else:
             span.set_attributes(
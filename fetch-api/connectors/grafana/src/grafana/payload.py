@@ -0,0 +1,53 @@
+import re, json
+
+
+
+class PayloadBuilder:
+    marker_pattern = re.compile(r'"\\u0000(\w+)\\u0000"')
+
+
+    def __init__(self, payload: dict, expression_key: str) -> None:
+        self.expression_key = expression_key
+
+        self.query_segments = PayloadBuilder.compile({
+            **payload['queries'][0],
+            expression_key: PayloadBuilder.marker('expression'),
+            'refId': PayloadBuilder.marker('ref_id')
+        })
+        self.payload_segments = PayloadBuilder.compile({
+            **payload,
+            'queries': PayloadBuilder.marker('queries')
+        })
+
+
+    @staticmethod
+    def marker(name: str) -> str:
+        return f'\u0000{name}\u0000'
+
+
+    @staticmethod
+    def compile(template: dict) -> list[str]:
+        return PayloadBuilder.marker_pattern.split(
+            json.dumps(template, separators=(',', ':'))
+        )
+
+
+    @staticmethod
+    def fill(segments: list[str], values: dict) -> str:
+        return ''.join(
+            values[segment] if index % 2 else segment
+            for index, segment in enumerate(segments)
+        )
+
+
+    def query(self, expression: str, ref_id: str = 'query') -> str:
+        return PayloadBuilder.fill(self.query_segments, {
+            'expression': json.dumps(expression),
+            'ref_id': json.dumps(ref_id)
+        })
+
+
+    def build(self, queries: list[str]) -> bytes:
+        return PayloadBuilder.fill(self.payload_segments, {
+            'queries': f'[{",".join(queries)}]'
+        }).encode()
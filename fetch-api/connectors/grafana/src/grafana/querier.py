@@ -1,11 +1,18 @@
-import os, copy
-from common.utils.system import read_file, render_template
+import os
+from jinja2 import exceptions as JinjaExceptions
+from common.utils.system import read_file, compile_template
 from common.telemetry.src.tracing.wrappers import traced
 from common.telemetry.src.tracing.helpers import reword
 from connectors.grafana.settings import settings
 from connectors.grafana.src.telemetry.logging import log
 from connectors.grafana.src.api import GrafanaClient, grafana_client
 from connectors.grafana.src.grafana.query_processor import Processor
+from connectors.grafana.src.grafana.cache import ResultCache
+from connectors.grafana.src.grafana.payload import PayloadBuilder
+from connectors.grafana.src.postgresql.client import PostgreSQLClient
+from connectors.grafana.src.prometheus.client import PrometheusClient
+from connectors.grafana.src.executors import direct_executor
+from common.utils.concurrency import submit_with_context
 
 
 
@@ -18,19 +25,33 @@ class Querier:
 
         self.client = client
         self.templates = {}
+        self.queries = {}
+        self.payloads = {}
+        self.engines = {}
+        self.cache = ResultCache(
+            max_items=settings.querier_cache_max_items,
+            wait_timeout=settings.querier_requests_timeout_seconds
+        )
 
         self.set_templates_struct()
         self.load_templates()
+        self.load_engines()
 
 
     def set_templates_struct(self) -> None:
         self.templates_struct = {
             'prometheus': {
                 'ds_uid': self.ds_uid_prometheus,
+                'expression_key': 'expr',
+                'shape': 'series',
+                'engines': ['grafana', 'direct'],
                 'templates': ['payload.json', 'queries.yaml']
             },
             'postgresql': {
                 'ds_uid': self.ds_uid_postgresql,
+                'expression_key': 'rawSql',
+                'shape': 'record',
+                'engines': ['grafana', 'direct'],
                 'templates': ['payload.json', 'queries.yaml']
             }
         }
@@ -86,6 +107,121 @@ class Querier:
                 })
                 raise SystemExit(1)
 
+            self.index_queries(ds_dir_name)
+
+            self.payloads[ds_dir_name] = PayloadBuilder(
+                self.templates[ds_dir_name]['payload'],
+                self.templates_struct[ds_dir_name]['expression_key']
+            )
+
+
+    def index_queries(self, ds_dir_name: str) -> None:
+        self.queries[ds_dir_name] = {}
+
+        for query in self.templates[ds_dir_name]['queries']:
+            expression = query['query']['query']
+
+            try:
+                template, variables = compile_template(expression)
+
+            except JinjaExceptions.TemplateError as err:
+                log.critical(f'{query["query"]["id"]} is not a valid query template for {ds_dir_name}', extra={
+                    'query_id': query['query']['id'],
+                    'error': str(err)
+                })
+                raise SystemExit(1)
+
+            engine = query['query'].get('engine', 'grafana')
+
+            if not engine in self.templates_struct[ds_dir_name]['engines']:
+                log.critical(f'{engine} is not a valid engine for {ds_dir_name} queries', extra={
+                    'query_id': query['query']['id'],
+                    'valid_engines': self.templates_struct[ds_dir_name]['engines']
+                })
+                raise SystemExit(1)
+
+            try:
+                plan = Processor.compile(
+                    query['query']['id'],
+                    query['query'].get('transform'),
+                    self.templates_struct[ds_dir_name]['shape']
+                )
+
+            except (ValueError, TypeError, KeyError) as err:
+                log.critical(f'{query["query"]["id"]} has an invalid transform for {ds_dir_name}', extra={
+                    'query_id': query['query']['id'],
+                    'error': str(err)
+                })
+                raise SystemExit(1)
+
+            self.queries[ds_dir_name][query['query']['id']] = {
+                'engine': engine,
+                'plan': plan,
+                'expression': expression,
+                'template': template if len(variables) > 0 else None,
+                'variables': variables,
+                'cache_ttl_seconds': query['query'].get('cache_ttl_seconds')
+            }
+
+
+    def load_engines(self) -> None:
+        for ds_type, queries in self.queries.items():
+            direct_queries = [
+                query for query in queries.values()
+                if query['engine'] == 'direct'
+            ]
+
+            if len(direct_queries) == 0:
+                continue
+
+            engine = self.create_engine(ds_type)
+
+            if engine is None:
+                log.warning(f'Direct {ds_type} engine is not configured, falling back to Grafana', extra={
+                    'ds_type': ds_type,
+                    'queries': len(direct_queries)
+                })
+
+                for query in direct_queries:
+                    query['engine'] = 'grafana'
+
+                continue
+
+            self.engines[ds_type] = engine
+            log.info(f'Running {len(direct_queries)} {ds_type} queries directly against the datasource')
+
+
+    def create_engine(self, ds_type: str) -> PostgreSQLClient | PrometheusClient | None:
+        if ds_type == 'postgresql':
+            if not settings.querier_postgresql_dsn or not PostgreSQLClient.is_available():
+                return None
+
+            engine = PostgreSQLClient(
+                dsn=settings.querier_postgresql_dsn,
+                min_size=settings.querier_postgresql_pool_min_size,
+                max_size=settings.querier_postgresql_pool_max_size,
+                timeout=settings.querier_requests_timeout_seconds
+            )
+            engine.open()
+
+            return engine
+
+        if ds_type == 'prometheus':
+            if not settings.querier_prometheus_url:
+                return None
+
+            return PrometheusClient(
+                url=settings.querier_prometheus_url,
+                pool_size=settings.querier_prometheus_pool_size,
+                timeout=settings.querier_requests_timeout_seconds
+            )
+
+        return None
+
+
+    def get_engine(self, query_ds_type: str, query_id: str) -> str:
+        return self.queries[query_ds_type][query_id]['engine']
+
 
     @traced('commit query')
     def commit(self, query_ds_type: str, query_id: str, query_params: dict | None = None, span=None) -> dict | None:
@@ -102,13 +238,25 @@ class Querier:
         )
 
         try:
-            expression = self.fetch(query_ds_type, query_id, query_params)
-            payload = self.render(query_ds_type, expression)
-            response = self.send(payload)
-            result = self.process(query_id, response.json())
+            expression, params = self.fetch(query_ds_type, query_id, query_params)
+            cache_ttl = self.get_cache_ttl(query_ds_type, query_id)
+
+            query_result, cache_status = self.cache.fetch(
+                ResultCache.create_key(query_ds_type, query_id, query_params),
+                cache_ttl,
+                self.query,
+                query_ds_type,
+                query_id,
+                query_params,
+                expression,
+                params
+            )
+            result = self.process(query_ds_type, query_id, {'results': {'query': query_result}})
 
             span.set_attributes({
-                'querier.query.status': 'successful'
+                'querier.query.status': 'successful',
+                'querier.cache.status': cache_status,
+                'querier.cache.ttl_seconds': cache_ttl or 0
             })
 
             return result
@@ -121,8 +269,271 @@ class Querier:
             })
 
 
+    @traced('commit batch query')
+    def commit_batch(self, queries: list[dict], span=None) -> dict | None:
+        span.set_attributes(
+            reword({
+                'querier.templates_dir': self.templates_dir,
+                'querier.batch.size': len(queries),
+                'querier.batch.query_ids': [query['query_id'] for query in queries]
+            })
+        )
+
+        try:
+            batch = []
+            direct = []
+            fallback = []
+            results = []
+            query_results = {}
+            volatile_fields = []
+            owned_keys = {}
+            shared_calls = {}
+
+            try:
+                for index, query in enumerate(queries):
+                    ref_id = f'query-{index}'
+                    statement = None
+
+                    results.append({
+                        'ds_type': query['ds_type'],
+                        'query_id': query['query_id'],
+                        'ref_id': ref_id,
+                        'status': 'failed',
+                        'cache_status': 'disabled',
+                        'total_items': 0,
+                        'items': []
+                    })
+
+                    if query['ds_type'] in self.templates_struct:
+                        statement = self.fetch(query['ds_type'], query['query_id'], query.get('params'))
+
+                    if statement is None:
+                        continue
+
+                    expression, params = statement
+
+                    cache_ttl = self.get_cache_ttl(query['ds_type'], query['query_id'])
+
+                    if cache_ttl:
+                        cache_key = ResultCache.create_key(query['ds_type'], query['query_id'], query.get('params'))
+                        query_result = self.cache.get(cache_key)
+
+                        if not query_result is None:
+                            query_results[ref_id] = query_result
+                            results[-1]['cache_status'] = 'hit'
+                            continue
+
+                        call, owner = self.cache.claim(cache_key)
+
+                        if not owner:
+                            shared_calls[ref_id] = call
+                            results[-1]['cache_status'] = 'shared'
+                            continue
+
+                        owned_keys[ref_id] = (cache_key, cache_ttl)
+                        results[-1]['cache_status'] = 'miss'
+
+                    if self.get_engine(query['ds_type'], query['query_id']) == 'direct':
+                        direct.append((query, ref_id, expression, params))
+                        continue
+
+                    batch.append((query['ds_type'], ref_id, expression))
+
+                direct_futures = [
+                    submit_with_context(direct_executor, self.query_direct, query['ds_type'], expression, params)
+                    for query, _, expression, params in direct
+                ]
+
+                if len(batch) > 0:
+                    self.send_batch(batch, owned_keys, query_results)
+
+                for (query, ref_id, _, _), future in zip(direct, direct_futures):
+                    try:
+                        query_result, cacheable = future.result()
+
+                    except Exception as err:
+                        span.add_event('batch direct query failed', attributes={
+                            'querier.query.ref_id': ref_id,
+                            'querier.error.message': str(err),
+                            'querier.error.type': type(err).__name__
+                        })
+
+                        expression, _ = self.fetch(query['ds_type'], query['query_id'], query.get('params'), 'grafana')
+                        fallback.append((query['ds_type'], ref_id, expression))
+                        continue
+
+                    if not cacheable:
+                        continue
+
+                    query_results[ref_id] = query_result
+
+                    if ref_id in owned_keys:
+                        cache_key, cache_ttl = owned_keys[ref_id]
+                        self.cache.set(cache_key, query_result, cache_ttl)
+
+                if len(fallback) > 0:
+                    try:
+                        self.send_batch(fallback, owned_keys, query_results)
+
+                    except Exception as err:
+                        span.add_event('batch fallback query failed', attributes={
+                            'querier.batch.fallback': len(fallback),
+                            'querier.error.message': str(err),
+                            'querier.error.type': type(err).__name__
+                        })
+
+            finally:
+                for ref_id, (cache_key, _) in owned_keys.items():
+                    self.cache.resolve(cache_key, result=query_results.get(ref_id))
+
+            for ref_id, call in shared_calls.items():
+                try:
+                    query_result = self.cache.wait(call)
+
+                    if not query_result is None:
+                        query_results[ref_id] = query_result
+
+                except Exception:
+                    continue
+
+            for result in results:
+                if not result['ref_id'] in query_results:
+                    continue
+
+                try:
+                    processed = self.process(
+                        result['ds_type'],
+                        result['query_id'],
+                        {'results': {result['ref_id']: query_results[result['ref_id']]}},
+                        result['ref_id']
+                    )
+
+                    result['status'] = 'successful'
+                    result['total_items'] = processed['total_items']
+                    result['items'] = processed['items']
+
+                    for volatile_field in processed.get('volatile_fields', []):
+                        if not volatile_field in volatile_fields:
+                            volatile_fields.append(volatile_field)
+
+                except Exception as err:
+                    span.add_event('batch query processing failed', attributes={
+                        'querier.query.id': result['query_id'],
+                        'querier.error.message': str(err),
+                        'querier.error.type': type(err).__name__
+                    })
+
+            items = [
+                item for result in results
+                for item in result.pop('items')
+            ]
+
+            span.set_attributes({
+                'querier.query.status': 'successful',
+                'querier.batch.failed': len([
+                    result for result in results
+                    if result['status'] == 'failed'
+                ]),
+                'querier.batch.sent': len(batch),
+                'querier.batch.direct': len(direct),
+                'querier.batch.fallback': len(fallback)
+            })
+
+            response = {
+                'total_items': len(items),
+                'items': items,
+                'queries': results
+            }
+
+            if len(volatile_fields) > 0:
+                response['volatile_fields'] = volatile_fields
+
+            return response
+
+        except Exception as err:
+            span.set_attributes({
+                'querier.query.status': 'failed',
+                'querier.error.message': str(err),
+                'querier.error.type': type(err).__name__
+            })
+
+
+    def get_cache_ttl(self, query_ds_type: str, query_id: str) -> int | None:
+        if not settings.querier_cache_enabled:
+            return None
+
+        query = self.queries.get(query_ds_type, {}).get(query_id)
+
+        if query is None:
+            return None
+
+        return query['cache_ttl_seconds']
+
+
+    def send_batch(self, batch: list[tuple[str, str, str]], owned_keys: dict, query_results: dict) -> None:
+        payload = self.render_batch(batch)
+        response = self.send(payload)
+        response_body = response.json()
+
+        for _, ref_id, _ in batch:
+            query_result = response_body.get('results', {}).get(ref_id)
+
+            if query_result is None or 'error' in query_result:
+                continue
+
+            query_results[ref_id] = query_result
+
+            if (ref_id in owned_keys) and (response.status_code == 200):
+                cache_key, cache_ttl = owned_keys[ref_id]
+                self.cache.set(cache_key, query_result, cache_ttl)
+
+
+    def query_direct(self, query_ds_type: str, expression: str, params: list | None) -> tuple[dict, bool]:
+        query_result, cacheable = self.engines[query_ds_type].query(expression, params)
+
+        if 'error' in query_result:
+            raise RuntimeError(query_result['error'])
+
+        return query_result, cacheable
+
+
+    @traced('run query')
+    def query(self, query_ds_type: str, query_id: str, query_params: dict, expression: str, params: list | None, span=None) -> tuple[dict, bool]:
+        engine = self.get_engine(query_ds_type, query_id)
+        span.set_attributes({'querier.engine': engine})
+
+        if engine == 'direct':
+            try:
+                query_result, cacheable = self.query_direct(query_ds_type, expression, params)
+                span.set_attributes({'querier.cache.cacheable': cacheable})
+
+                return query_result, cacheable
+
+            except Exception as err:
+                span.set_attributes({
+                    'querier.engine.fallback': 'grafana',
+                    'querier.engine.error.message': str(err),
+                    'querier.engine.error.type': type(err).__name__
+                })
+
+                expression, _ = self.fetch(query_ds_type, query_id, query_params, 'grafana')
+
+        payload = self.render(query_ds_type, expression)
+        response = self.send(payload)
+        query_result = response.json()['results']['query']
+
+        cacheable = (response.status_code == 200) and (not 'error' in query_result)
+
+        span.set_attributes({
+            'querier.response.status_code': response.status_code,
+            'querier.cache.cacheable': cacheable
+        })
+
+        return query_result, cacheable
+
+
     @traced('fetch query blueprint')
-    def fetch(self, query_ds_type: str, query_id: str, query_params: dict | None = None, span=None) -> str | None:
+    def fetch(self, query_ds_type: str, query_id: str, query_params: dict | None = None, engine: str | None = None, span=None) -> tuple[str, list | None] | None:
         query_params = query_params or {}
 
         span.set_attributes({
@@ -137,51 +548,83 @@ class Querier:
             })
             return None
 
-        span.add_event('search started')
+        query = self.queries[query_ds_type].get(query_id)
 
-        for query in self.templates[query_ds_type]['queries']:
-            if query['query']['id'] == query_id:
-                expression = copy.deepcopy(query['query']['query'])
+        if query is None:
+            span.set_attributes({
+                'querier.error.message': f'No query found for id {query_id} in datasource type {query_ds_type}'
+            })
+            return None
 
-                span.add_event('search completed', attributes={
-                    'querier.queries.template.path': f'{self.templates_dir}/{query_ds_type}/queries.yaml'
-                })
+        engine = engine or query['engine']
+        bind_params = [] if engine == 'direct' else None
 
-                if len(query_params) > 0:
-                    expression = render_template(
-                        content=expression,
-                        vars=query_params
-                    )
+        span.set_attributes({'querier.engine': engine})
 
-                    span.set_attributes({
-                        'querier.query.expression.templated': True,
-                        'querier.query.expression': expression
-                    })
+        if query['template'] is None:
+            span.set_attributes({
+                'querier.query.expression.templated': False,
+                'querier.query.expression': query['expression']
+            })
 
-                else:
-                    span.set_attributes({
-                        'querier.query.expression.templated': False,
-                        'querier.query.expression': expression
-                    })
+            return query['expression'], bind_params
 
-                return expression
+        try:
+            expression = query['template'].render({
+                **{
+                    variable: query_params[variable]
+                    for variable in query['variables']
+                    if variable in query_params
+                },
+                'bind_params': bind_params
+            })
 
-        span.set_attributes({
-            'querier.error.message': f'No query found for id {query_id} in datasource type {query_ds_type}'
-        })
-        return None
+        except JinjaExceptions.UndefinedError as err:
+            span.set_attributes({
+                'querier.error.message': f'Missing parameters for query {query_id}: {str(err)}',
+                'querier.query.variables': sorted(query['variables'])
+            })
+            return None
+
+        span.set_attributes(
+            reword({
+                'querier.query.expression.templated': True,
+                'querier.query.expression': expression,
+                'querier.query.params': bind_params or []
+            })
+        )
+
+        return expression, bind_params
 
 
     @traced('render query payload')
-    def render(self, query_ds_type: str, expression: str,  span=None) -> dict:
-        payload = copy.deepcopy(self.templates[query_ds_type]['payload'])
-        expression_key = 'rawSql' if query_ds_type == 'postgresql' else 'expr'
-        payload['queries'][0][expression_key] = expression
+    def render(self, query_ds_type: str, expression: str,  span=None) -> bytes:
+        payload_builder = self.payloads[query_ds_type]
+        payload = payload_builder.build([
+            payload_builder.query(expression)
+        ])
 
         span.set_attributes(
             reword({
                 'querier.payload.template.path': f'{self.templates_dir}/{query_ds_type}/payload.json',
-                'querier.query.expression.type': expression_key,
+                'querier.query.expression.type': payload_builder.expression_key,
+                'querier.query.payload': payload
+            })
+        )
+
+        return payload
+
+
+    @traced('render batch query payload')
+    def render_batch(self, batch: list[tuple[str, str, str]], span=None) -> bytes:
+        payload = self.payloads[batch[0][0]].build([
+            self.payloads[query_ds_type].query(expression, ref_id)
+            for query_ds_type, ref_id, expression in batch
+        ])
+
+        span.set_attributes(
+            reword({
+                'querier.batch.size': len(batch),
                 'querier.query.payload': payload
             })
         )
@@ -190,7 +633,7 @@ class Querier:
 
 
     @traced('send query')
-    def send(self, query_payload: str, span=None) -> dict | None:
+    def send(self, query_payload: bytes, span=None) -> dict | None:
         try:
             response = self.client.post(
                 endpoint = self.default_endpoint,
@@ -220,8 +663,8 @@ class Querier:
 
 
     @traced('process query response')
-    def process(self, query_id: str, query_response: dict, span=None) -> dict | None:
-        return Processor.process(query_id, query_response)
+    def process(self, query_ds_type: str, query_id: str, query_response: dict, ref_id: str = 'query', span=None) -> dict | None:
+        return Processor.process(self.queries[query_ds_type][query_id]['plan'], query_response, ref_id)
 
 
 querier = Querier(grafana_client)
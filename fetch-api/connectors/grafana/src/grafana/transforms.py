@@ -0,0 +1,450 @@
+import inspect
+from typing import Any, Callable
+from common.utils.helpers import TimeUtils, Timestamps, DataUtils
+from connectors.grafana.src.grafana.cache import RecordMemo
+
+
+
+MISSING = object()
+
+
+class Columns:
+    @staticmethod
+    def from_frame(frame: dict, limit: int | None = None) -> dict[str, list]:
+        return {
+            field['name']: values if limit is None else values[:limit]
+            for field, values in zip(frame['schema']['fields'], frame['data']['values'])
+        }
+
+
+    @staticmethod
+    def from_rows(rows: list[dict]) -> dict[str, list]:
+        names = {}
+
+        for row in rows:
+            for name in row:
+                names[name] = None
+
+        return {
+            name: [row.get(name, MISSING) for row in rows]
+            for name in names
+        }
+
+
+    @staticmethod
+    def from_series(query_result: dict) -> list[tuple[dict, Any]]:
+        if 'series' in query_result:
+            return [
+                (series['labels'], series['value'])
+                for series in query_result['series']
+            ]
+
+        return [
+            (frame['schema']['fields'][1]['labels'], frame['data']['values'][1][0])
+            for frame in query_result.get('frames', [])
+        ]
+
+
+    @staticmethod
+    def drop(columns: dict[str, list], names: frozenset) -> dict[str, list]:
+        return {
+            name: values
+            for name, values in columns.items()
+            if not name in names
+        }
+
+
+    @staticmethod
+    def rename(columns: dict[str, list], names: dict[str, str]) -> dict[str, list]:
+        return {
+            names.get(name, name): values
+            for name, values in columns.items()
+        }
+
+
+    @staticmethod
+    def round(values: list, digits: int, scale: float = 1, default: Any = 'N/A') -> list:
+        if scale == 1:
+            return [
+                default if value is None else value if value is MISSING else round(value, digits)
+                for value in values
+            ]
+
+        return [
+            default if value is None else value if value is MISSING else round(value * scale, digits)
+            for value in values
+        ]
+
+
+    @staticmethod
+    def take(columns: dict[str, list], indexes: list[int]) -> dict[str, list]:
+        return {
+            name: [values[index] for index in indexes]
+            for name, values in columns.items()
+        }
+
+
+    @staticmethod
+    def subtract(minuends: list, subtrahends: list) -> list:
+        return [
+            MISSING if (minuend is None or subtrahend is None or minuend is MISSING or subtrahend is MISSING) else minuend - subtrahend
+            for minuend, subtrahend in zip(minuends, subtrahends)
+        ]
+
+
+    @staticmethod
+    def to_rows(columns: dict[str, list]) -> list[dict]:
+        names = list(columns.keys())
+        values = list(columns.values())
+        dense = len(names)
+
+        for index, column in enumerate(values):
+            if MISSING in column:
+                dense = index
+                break
+
+        if dense == 0:
+            rows = [{} for _ in values[0]]
+        else:
+            rows = [dict(zip(names[:dense], row)) for row in zip(*values[:dense])]
+
+        for name in names[dense:]:
+            for row, value in zip(rows, columns[name]):
+                if not value is MISSING:
+                    row[name] = value
+
+        return rows
+
+
+
+class TransformContext:
+    def __init__(self, columns: dict[str, list]) -> None:
+        self.columns = columns
+        self.size = len(next(iter(columns.values()), []))
+        self.timestamps = {}
+        self.derived = {}
+
+
+    def column(self, name: str) -> list:
+        if not name in self.columns:
+            return [MISSING] * self.size
+
+        return self.columns[name]
+
+
+    def time(self, name: str) -> Timestamps:
+        if not name in self.timestamps:
+            self.timestamps[name] = Timestamps(self.column(name))
+
+        return self.timestamps[name]
+
+
+    def derive(self, key: tuple, function: Callable) -> list:
+        if not key in self.derived:
+            self.derived[key] = function()
+
+        return self.derived[key]
+
+
+
+class TransformFunctions:
+    volatile = ['since']
+
+
+    @staticmethod
+    def round(context: TransformContext, field: str, digits: int = 0, scale: float = 1, default: Any = 'N/A') -> list:
+        return Columns.round(context.column(field), digits, scale, default)
+
+
+    @staticmethod
+    def local_time(context: TransformContext, field: str, default: Any = 'N/A') -> list:
+        return context.time(field).iso_local(default)
+
+
+    @staticmethod
+    def utc_time(context: TransformContext, field: str, default: Any = None) -> list:
+        return context.time(field).iso_utc(default)
+
+
+    @staticmethod
+    def ordinal(context: TransformContext, field: str) -> list:
+        return context.time(field).ordinal(MISSING)
+
+
+    @staticmethod
+    def since(context: TransformContext, field: str, instant: bool = True) -> list:
+        return context.time(field).since_now(instant, MISSING)
+
+
+    @staticmethod
+    def duration(context: TransformContext, start: str, end: str, instant: bool = False) -> list:
+        return context.time(start).since(context.time(end), instant, MISSING)
+
+
+    @staticmethod
+    def duration_minutes(context: TransformContext, field: str) -> list:
+        return [
+            MISSING if (value is None or value is MISSING) else TimeUtils.time_since_minutes_only(round(value, 0))
+            for value in context.column(field)
+        ]
+
+
+    @staticmethod
+    def subtract(context: TransformContext, minuend: str, subtrahend: str) -> list:
+        return Columns.subtract(context.column(minuend), context.column(subtrahend))
+
+
+    @staticmethod
+    def maps_url(context: TransformContext, field: str, default: Any = 'N/A') -> list:
+        return context.derive(('maps_url', field, default), lambda: [
+            default if path is None else DataUtils.get_maps_url(path)
+            for path in context.column(field)
+        ])
+
+
+    @staticmethod
+    def maps_directions(context: TransformContext, start: str, end: str) -> list:
+        return [
+            DataUtils.get_maps_directions_url(start_url, end_url)
+            for start_url, end_url in zip(
+                TransformFunctions.maps_url(context, start),
+                TransformFunctions.maps_url(context, end)
+            )
+        ]
+
+
+    @staticmethod
+    def teslamate_drive_url(context: TransformContext, drive_id: str, start: str, end: str) -> list:
+        return [
+            'N/A' if (start_time is None or end_time is None) else DataUtils.get_teslamate_drive_grafana_url(
+                drive_id=drive,
+                drive_start_time=start_time,
+                drive_end_time=end_time
+            )
+            for drive, start_time, end_time in zip(
+                context.column(drive_id),
+                context.time(start).iso_utc(),
+                context.time(end).iso_utc()
+            )
+        ]
+
+
+    @staticmethod
+    def get(name: str) -> Callable:
+        function = getattr(TransformFunctions, name, None)
+
+        if name.startswith('_') or name in ['get'] or not callable(function):
+            raise ValueError(f'Unknown transform function {name}')
+
+        return function
+
+
+
+class TransformPlan:
+    shapes = ['record', 'table', 'series']
+    time_formats = {
+        'local': 'local_time',
+        'utc': 'utc_time'
+    }
+    memo_max_items = 4096
+    sort_keys = {
+        'value': lambda value, _: value,
+        'lower': lambda value, _: value.lower(),
+        'equals': lambda value, expected: value == expected
+    }
+
+
+    def __init__(self, query_id: str, spec: dict | None, default_shape: str = 'record') -> None:
+        spec = spec or {}
+
+        self.query_id = query_id
+        self.shape = spec.get('shape', default_shape)
+        self.drop = frozenset(spec.get('drop', []))
+        self.rename = dict(spec.get('rename', {}))
+        self.series_value = spec.get('value')
+        self.pivot = None
+        self.steps = []
+        self.sort = []
+        self.memo = None
+        self.volatile_fields = []
+
+        if not self.shape in TransformPlan.shapes:
+            raise ValueError(f'Unknown shape {self.shape}, expected one of {TransformPlan.shapes}')
+
+        if 'pivot' in spec:
+            if self.shape != 'series':
+                raise ValueError('pivot is only supported for series shapes')
+
+            self.pivot = (spec['pivot']['column'], tuple(spec['pivot']['by']))
+
+        for field, options in spec.get('round', {}).items():
+            options = options if isinstance(options, dict) else {'digits': options}
+            self.add_step(field, 'round', [field], options)
+
+        for field, time_format in spec.get('time', {}).items():
+            if not time_format in TransformPlan.time_formats:
+                raise ValueError(f'Unknown time format {time_format} for {field}, expected one of {list(TransformPlan.time_formats)}')
+
+            self.add_step(field, TransformPlan.time_formats[time_format], [field], {})
+
+        for field, options in spec.get('derive', {}).items():
+            options = dict(options)
+
+            if not 'function' in options:
+                raise ValueError(f'Missing function for derived field {field}')
+
+            self.add_step(field, options.pop('function'), options.pop('fields', [field]), options)
+
+        for sort in spec.get('sort', []):
+            key = sort.get('key', 'value')
+
+            if not key in TransformPlan.sort_keys:
+                raise ValueError(f'Unknown sort key {key}, expected one of {list(TransformPlan.sort_keys)}')
+
+            self.sort.append((sort['field'], TransformPlan.sort_keys[key], sort.get('value'), sort.get('reverse', False)))
+
+        for field, options in spec.get('volatile', {}).items():
+            if not 'since' in options:
+                raise ValueError(f'Missing since field for volatile field {field}')
+
+            self.volatile_fields.append({
+                'field': field,
+                'since': options['since']
+            })
+
+        if 'memoize' in spec:
+            if self.shape != 'table':
+                raise ValueError('memoize is only supported for table shapes')
+
+            self.memo_key = spec['memoize']['key']
+            self.memo_complete = spec['memoize'].get('complete')
+            self.memo = RecordMemo(spec['memoize'].get('max_items', TransformPlan.memo_max_items))
+
+        self.stable_steps = [
+            step for step in self.steps
+            if not step[1].__name__ in TransformFunctions.volatile
+        ]
+        self.volatile_steps = [
+            step for step in self.steps
+            if step[1].__name__ in TransformFunctions.volatile
+        ]
+
+
+    def add_step(self, output: str, function_name: str, fields: list[str], options: dict) -> None:
+        function = TransformFunctions.get(function_name)
+
+        try:
+            inspect.signature(function).bind(None, *fields, **options)
+
+        except TypeError as err:
+            raise ValueError(f'Invalid arguments for {function_name} in {output}: {err}')
+
+        self.steps.append((output, function, tuple(fields), options))
+
+
+    def read(self, query_result: dict) -> dict[str, list]:
+        if self.shape == 'series':
+            series = Columns.from_series(query_result)
+
+            if self.pivot is None:
+                return Columns.from_rows([
+                    labels if self.series_value is None else {**labels, self.series_value: value}
+                    for labels, value in series
+                ])
+
+            column, by = self.pivot
+            rows = {}
+
+            for labels, value in series:
+                signature = tuple(labels[label] for label in by)
+
+                if not signature in rows:
+                    rows[signature] = {label: labels[label] for label in by}
+
+                rows[signature][labels[column]] = value
+
+            return Columns.from_rows(list(rows.values()))
+
+        frames = query_result.get('frames', [])
+
+        if not frames:
+            return {}
+
+        return Columns.from_frame(frames[0], limit=1 if self.shape == 'record' else None)
+
+
+    @staticmethod
+    def run(columns: dict[str, list], steps: list[tuple]) -> list[dict]:
+        context = TransformContext(columns)
+
+        return Columns.to_rows({
+            **columns,
+            **{
+                output: function(context, *fields, **options)
+                for output, function, fields, options in steps
+            }
+        })
+
+
+    def run_memoized(self, columns: dict[str, list], span=None) -> list[dict]:
+        keys = columns[self.memo_key]
+        cached = self.memo.get_many(keys)
+        fresh = [index for index, key in enumerate(keys) if not key in cached]
+        fresh_rows = []
+
+        if len(fresh) > 0:
+            subset = columns if len(fresh) == len(keys) else Columns.take(columns, fresh)
+            fresh_rows = TransformPlan.run(subset, self.stable_steps)
+            completed = subset[self.memo_complete] if self.memo_complete else [True] * len(fresh)
+
+            self.memo.set_many({
+                key: dict(row)
+                for key, row, complete in zip(subset[self.memo_key], fresh_rows, completed)
+                if not (key is None or complete is None)
+            })
+
+        fresh_rows = iter(fresh_rows)
+        rows = [
+            dict(cached[key]) if key in cached else next(fresh_rows)
+            for key in keys
+        ]
+
+        if len(self.volatile_steps) > 0:
+            context = TransformContext(columns)
+
+            for output, function, fields, options in self.volatile_steps:
+                for row, value in zip(rows, function(context, *fields, **options)):
+                    if not value is MISSING:
+                        row[output] = value
+
+        if not span is None:
+            span.set_attributes({
+                'processor.memo.hits': len(keys) - len(fresh),
+                'processor.memo.misses': len(fresh),
+                'processor.memo.size': len(self.memo)
+            })
+
+        return rows
+
+
+    def apply(self, query_result: dict, span=None) -> list[dict]:
+        columns = self.read(query_result)
+
+        if len(next(iter(columns.values()), [])) == 0:
+            return []
+
+        if self.drop:
+            columns = Columns.drop(columns, self.drop)
+
+        if self.rename:
+            columns = Columns.rename(columns, self.rename)
+
+        if self.memo is None:
+            rows = TransformPlan.run(columns, self.steps)
+        else:
+            rows = self.run_memoized(columns, span)
+
+        for field, key, expected, reverse in reversed(self.sort):
+            rows.sort(key=lambda row: key(row[field], expected), reverse=reverse)
+
+        return rows
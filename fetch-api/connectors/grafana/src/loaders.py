@@ -27,11 +27,12 @@ class SettingsLoader:
 class RoutesLoader:
     @staticmethod
     def load(app, settings):
-        from connectors.grafana.src.routes import (internal, prometheus, postgresql)
+        from connectors.grafana.src.routes import (internal, prometheus, postgresql, batch)
 
         app.include_router(internal.router, prefix="/api")
         app.include_router(prometheus.router, prefix="/prometheus")
         app.include_router(postgresql.router, prefix="/postgresql")
+        app.include_router(batch.router)
 
         if settings.authenticated:
             log.info(
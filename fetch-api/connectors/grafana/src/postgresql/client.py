@@ -0,0 +1,126 @@
+import uuid
+from decimal import Decimal
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Any
+from common.telemetry.src.tracing.wrappers import traced
+from common.telemetry.src.tracing.helpers import reword
+
+try:
+    import psycopg
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    psycopg = None
+    ConnectionPool = None
+
+
+
+class PostgreSQLClient:
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 4, timeout: int = 30) -> None:
+        if psycopg is None:
+            raise ImportError('Direct PostgreSQL engine requires the psycopg and psycopg_pool packages')
+
+        self.timeout = timeout
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            timeout=timeout,
+            kwargs={
+                'autocommit': True,
+                'cursor_factory': psycopg.RawCursor,
+                'options': f'-c statement_timeout={timeout * 1000}'
+            },
+            name='teslamate',
+            open=False
+        )
+
+
+    @staticmethod
+    def is_available() -> bool:
+        return not psycopg is None
+
+
+    def open(self) -> None:
+        self.pool.open(wait=False)
+
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+    @staticmethod
+    def convert(value: Any) -> Any:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+
+            return int(value.timestamp() * 1000)
+
+        if isinstance(value, date):
+            return int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+        if isinstance(value, Decimal):
+            return float(value)
+
+        if isinstance(value, timedelta):
+            return value.total_seconds()
+
+        if isinstance(value, (time, uuid.UUID)):
+            return str(value)
+
+        return value
+
+
+    @traced('run postgresql query')
+    def query(self, expression: str, params: list | None = None, span=None) -> tuple[dict, bool]:
+        span.set_attributes({
+            'postgresql.pool.name': self.pool.name,
+            'postgresql.query.prepared': True,
+            'postgresql.query.params': len(params or {})
+        })
+
+        try:
+            with self.pool.connection() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(expression, params, prepare=True)
+
+                    fields = [column.name for column in cursor.description]
+                    rows = cursor.fetchall()
+
+            span.set_attributes({
+                'postgresql.response.rows': len(rows),
+                'postgresql.response.fields': len(fields)
+            })
+
+            if len(rows) == 0:
+                return {'frames': []}, True
+
+            return {
+                'frames': [
+                    {
+                        'schema': {
+                            'fields': [{'name': field} for field in fields]
+                        },
+                        'data': {
+                            'values': [
+                                [PostgreSQLClient.convert(value) for value in column]
+                                for column in zip(*rows)
+                            ]
+                        }
+                    }
+                ]
+            }, True
+
+        except Exception as err:
+            span.set_attributes(
+                reword({
+                    'postgresql.error.message': str(err),
+                    'postgresql.error.type': type(err).__name__,
+                    'postgresql.query.expression': expression
+                })
+            )
+
+            return {
+                'error': str(err),
+                'frames': []
+            }, False
@@ -0,0 +1,83 @@
+import requests
+from requests.adapters import HTTPAdapter
+from common.telemetry.src.tracing.wrappers import traced
+from common.telemetry.src.tracing.helpers import reword
+
+
+
+class PrometheusClient:
+    def __init__(self, url: str, pool_size: int = 4, timeout: int = 30) -> None:
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size
+        )
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Accept'] = 'application/json'
+
+
+    def close(self) -> None:
+        self.session.close()
+
+
+    @traced('run prometheus query')
+    def query(self, expression: str, params: list | None = None, span=None) -> tuple[dict, bool]:
+        span.set_attributes({
+            'prometheus.url': self.url,
+            'prometheus.endpoint': 'api/v1/query'
+        })
+
+        try:
+            response = self.session.post(
+                f'{self.url}/api/v1/query',
+                data={'query': expression},
+                timeout=self.timeout
+            )
+            response_body = response.json()
+
+            span.set_attributes({
+                'prometheus.response.status_code': response.status_code
+            })
+
+            if response_body.get('status') != 'success':
+                raise ValueError(response_body.get('error', f'Unexpected response status {response.status_code}'))
+
+            if response_body['data']['resultType'] != 'vector':
+                raise ValueError(f'Unsupported result type {response_body["data"]["resultType"]}')
+
+            series = [
+                {
+                    'labels': {
+                        label: label_value
+                        for label, label_value in result['metric'].items()
+                        if label != '__name__'
+                    },
+                    'value': float(result['value'][1])
+                }
+                for result in response_body['data']['result']
+            ]
+
+            span.set_attributes({
+                'prometheus.response.series': len(series)
+            })
+
+            return {'series': series}, True
+
+        except Exception as err:
+            span.set_attributes(
+                reword({
+                    'prometheus.error.message': str(err),
+                    'prometheus.error.type': type(err).__name__,
+                    'prometheus.query.expression': expression
+                })
+            )
+
+            return {
+                'error': str(err),
+                'series': []
+            }, False
@@ -0,0 +1,16 @@
+from connectors.grafana.src.api_processor import APIProcessor
+from connectors.grafana.src.schemas.batch import RequestBatch
+from fastapi import APIRouter
+
+
+router = APIRouter()
+
+
+@router.post('/batch', tags=['batch'], summary='Run multiple queries in a single Grafana request')
+def run_batch(request: RequestBatch) -> dict:
+    return APIProcessor.process_batch_request(
+        queries=[
+            query.model_dump()
+            for query in request.queries
+        ]
+    )
@@ -13,7 +13,8 @@ def health() -> dict:
         'health_endpoint': settings.health_endpoint,
         'health_last_check': settings.health_last_check,
         'health_next_check': settings.health_next_check,
-        'authenticated': settings.authenticated
+        'authenticated': settings.authenticated,
+        'auth_last_check': settings.auth_last_check
     }
 
 
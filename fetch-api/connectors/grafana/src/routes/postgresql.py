@@ -46,11 +46,25 @@ def get_car_average_consumption() -> dict:
 
 
 @router.get('/car-drives-history', tags=['postgresql'], summary='Retrieve car drives history from Teslamate')
-def get_car_drives(number_of_drives: int = Query(5, ge=1, le=1000, description='How many recent drive records to retrieve')) -> dict:
+def get_car_drives(
+    number_of_drives: int = Query(5, ge=1, le=1000, description='How many recent drive records to retrieve'),
+    car_id: int = Query(1, ge=1, description='Teslamate id of the car to retrieve drives for'),
+    after_drive_id: int | None = Query(None, ge=0, description='Only retrieve drives with an id greater than this one'),
+    before_drive_id: int | None = Query(None, ge=1, description='Only retrieve drives with an id lower than this one')
+) -> dict:
+    query_params = {
+        'number_of_drives': number_of_drives,
+        'car_id': car_id
+    }
+
+    if not after_drive_id is None:
+        query_params['after_drive_id'] = after_drive_id
+
+    if not before_drive_id is None:
+        query_params['before_drive_id'] = before_drive_id
+
     return APIProcessor.process_request(
         query_ds_type='postgresql',
         query_id='teslamate-car-drives-info',
-        query_params={
-            'number_of_drives': number_of_drives
-        }
+        query_params=query_params
     )
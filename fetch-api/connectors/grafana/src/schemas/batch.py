@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+
+class BatchQuery(BaseModel):
+    ds_type: str
+    query_id: str
+    params: dict = {}
+
+
+class RequestBatch(BaseModel):
+    queries: list[BatchQuery]
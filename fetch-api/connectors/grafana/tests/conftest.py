@@ -0,0 +1,87 @@
+import os, sys, json, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+    def reply(self, status_code: int, body: dict) -> None:
+        content = json.dumps(body).encode()
+
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+    def do_GET(self) -> None:
+        self.reply(200, {})
+
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.server.requests.append((self.path, body))
+
+        if self.path == '/prometheus/api/v1/query':
+            self.reply(*self.server.prometheus)
+            return
+
+        queries = json.loads(body)['queries']
+
+        self.reply(200, {
+            'results': {
+                query['refId']: self.server.grafana[query['refId']]
+                for query in queries
+                if query['refId'] in self.server.grafana
+            }
+        })
+
+
+stub_server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+stub_server.requests = []
+stub_server.prometheus = (200, {})
+stub_server.grafana = {}
+stub_url = f'http://127.0.0.1:{stub_server.server_address[1]}'
+
+threading.Thread(target=stub_server.serve_forever, daemon=True).start()
+
+os.environ.update({
+    'URL': stub_url,
+    'SA_TOKEN': 'test',
+    'LOG_LEVEL': 'critical',
+    'OTLP_ENDPOINT_GRPC': 'localhost:4317',
+    'QUERIER_TEMPLATES_DIR': os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'templates')),
+    'QUERIER_CACHE_ENABLED': 'false',
+    'QUERIER_PROMETHEUS_URL': f'{stub_url}/prometheus'
+})
+os.environ.pop('QUERIER_POSTGRESQL_DSN', None)
+
+
+@pytest.fixture
+def stub():
+    stub_server.requests.clear()
+    stub_server.prometheus = (200, {})
+    stub_server.grafana = {}
+
+    yield stub_server
+
+
+@pytest.fixture
+def querier():
+    from connectors.grafana.settings import settings
+    from connectors.grafana.src.grafana.querier import querier
+
+    settings.healthy = True
+
+    return querier
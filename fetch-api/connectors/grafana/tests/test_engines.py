@@ -0,0 +1,374 @@
+import json, threading
+from decimal import Decimal
+from datetime import datetime, timezone
+from connectors.grafana.src.postgresql.client import PostgreSQLClient
+from connectors.grafana.src.prometheus.client import PrometheusClient
+
+
+ARGOCD_SERIES = [
+    ({'name': 'vault', 'namespace': 'argocd', 'health_status': 'Degraded'}, 1),
+    ({'name': 'Immich', 'namespace': 'argocd', 'health_status': 'Healthy'}, 1),
+    ({'name': 'grafana', 'namespace': 'argocd', 'health_status': 'Healthy'}, 1)
+]
+
+LONGHORN_SERIES = [
+    ({'pvc': 'postgres', 'pvc_namespace': 'teslamate', 'metric': 'pvc_usage_percentage'}, 41.237),
+    ({'pvc': 'postgres', 'pvc_namespace': 'teslamate', 'metric': 'pvc_usage_gb'}, 4.1237),
+    ({'pvc': 'postgres', 'pvc_namespace': 'teslamate', 'metric': 'pvc_capacity_gb'}, 10.0),
+    ({'pvc': 'library', 'pvc_namespace': 'immich', 'metric': 'pvc_usage_percentage'}, 87.55),
+    ({'pvc': 'library', 'pvc_namespace': 'immich', 'metric': 'pvc_usage_gb'}, 175.1),
+    ({'pvc': 'library', 'pvc_namespace': 'immich', 'metric': 'pvc_capacity_gb'}, 200.0)
+]
+
+CAR_STATE_ROWS = (
+    ['state', 'since'],
+    [('online', datetime(2026, 10, 18, 12, 0, 0))]
+)
+
+
+
+class Column:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class Cursor:
+    def __init__(self, pool: 'Pool') -> None:
+        self.pool = pool
+
+    def __enter__(self) -> 'Cursor':
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def execute(self, expression: str, params: dict | None = None, prepare: bool | None = None) -> None:
+        if not self.pool.error is None:
+            raise self.pool.error
+
+        self.pool.executed.append((expression, params, prepare))
+
+    @property
+    def description(self) -> list[Column]:
+        return [Column(name) for name in self.pool.fields]
+
+    def fetchall(self) -> list[tuple]:
+        return self.pool.rows
+
+
+class Connection:
+    def __init__(self, pool: 'Pool') -> None:
+        self.pool = pool
+
+    def __enter__(self) -> 'Connection':
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def cursor(self) -> Cursor:
+        return Cursor(self.pool)
+
+
+class Pool:
+    name = 'teslamate'
+
+    def __init__(self, fields: list[str], rows: list[tuple], error: Exception | None = None) -> None:
+        self.fields = fields
+        self.rows = rows
+        self.error = error
+        self.executed = []
+
+    def connection(self) -> Connection:
+        return Connection(self)
+
+
+
+def create_postgresql_engine(fields: list[str], rows: list[tuple], error: Exception | None = None) -> PostgreSQLClient:
+    engine = PostgreSQLClient('postgresql://test@127.0.0.1:1/teslamate')
+    engine.pool = Pool(fields, rows, error)
+
+    return engine
+
+
+def epoch_ms(*args: int) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def prometheus_vector(series: list[tuple[dict, float]]) -> dict:
+    return {
+        'status': 'success',
+        'data': {
+            'resultType': 'vector',
+            'result': [
+                {
+                    'metric': {'__name__': 'series', **labels},
+                    'value': [1760000000, str(value)]
+                } for labels, value in series
+            ]
+        }
+    }
+
+
+def grafana_frames(series: list[tuple[dict, float]]) -> dict:
+    return {
+        'frames': [
+            {
+                'schema': {
+                    'fields': [
+                        {'name': 'Time', 'type': 'time'},
+                        {'name': 'Value', 'type': 'number', 'labels': labels}
+                    ]
+                },
+                'data': {
+                    'values': [[1760000000000], [value]]
+                }
+            } for labels, value in series
+        ]
+    }
+
+
+def commit_through_grafana(querier, monkeypatch, ds_type: str, query_id: str) -> dict:
+    monkeypatch.setitem(querier.queries[ds_type][query_id], 'engine', 'grafana')
+
+    return querier.commit(ds_type, query_id)
+
+
+
+def test_postgresql_engine_returns_grafana_frames() -> None:
+    engine = create_postgresql_engine(
+        ['id', 'start_date', 'distance', 'end_date'],
+        [
+            (2, datetime(2026, 10, 18, 10, 0, 0), Decimal('12.5'), None),
+            (1, datetime(2026, 10, 17, 8, 30, 0, tzinfo=timezone.utc), Decimal('3.25'), datetime(2026, 10, 17, 9, 0, 0))
+        ]
+    )
+
+    query_result, cacheable = engine.query('SELECT 1')
+
+    assert cacheable is True
+    assert query_result == {
+        'frames': [
+            {
+                'schema': {
+                    'fields': [
+                        {'name': 'id'},
+                        {'name': 'start_date'},
+                        {'name': 'distance'},
+                        {'name': 'end_date'}
+                    ]
+                },
+                'data': {
+                    'values': [
+                        [2, 1],
+                        [epoch_ms(2026, 10, 18, 10, 0), epoch_ms(2026, 10, 17, 8, 30)],
+                        [12.5, 3.25],
+                        [None, epoch_ms(2026, 10, 17, 9, 0)]
+                    ]
+                }
+            }
+        ]
+    }
+
+
+def test_postgresql_engine_returns_no_frames_without_rows() -> None:
+    engine = create_postgresql_engine(['id'], [])
+
+    assert engine.query('SELECT 1') == ({'frames': []}, True)
+
+
+def test_postgresql_engine_reports_errors() -> None:
+    engine = create_postgresql_engine(['id'], [], error=RuntimeError('connection refused'))
+
+    query_result, cacheable = engine.query('SELECT 1')
+
+    assert cacheable is False
+    assert query_result == {'error': 'connection refused', 'frames': []}
+
+
+def test_postgresql_engine_matches_grafana_backend(querier, stub) -> None:
+    engine = create_postgresql_engine(*CAR_STATE_ROWS)
+    direct_result, _ = engine.query('SELECT 1')
+
+    stub.grafana['query'] = direct_result
+    grafana_result = querier.commit('postgresql', 'teslamate-car-state')
+
+    assert grafana_result['items'] == querier.process(
+        'postgresql',
+        'teslamate-car-state',
+        {'results': {'query': direct_result}},
+        'query'
+    )['items']
+    assert grafana_result['items'][0]['state'] == 'online'
+
+
+def test_postgresql_engine_binds_params() -> None:
+    engine = create_postgresql_engine(['id'], [(7,)])
+
+    engine.query('SELECT id FROM drives WHERE car_id = $1', [2])
+
+    assert engine.pool.executed == [
+        ('SELECT id FROM drives WHERE car_id = $1', [2], True)
+    ]
+
+
+def test_drives_query_binds_params_for_direct_engine(querier) -> None:
+    query_params = {'number_of_drives': '5', 'car_id': 2, 'after_drive_id': 40}
+
+    expression, params = querier.fetch('postgresql', 'teslamate-car-drives-info', query_params, 'direct')
+
+    assert params == [2, 40, 5]
+    assert 'drives.car_id = $1' in expression
+    assert 'drives.id > $2' in expression
+    assert 'LIMIT $3;' in expression
+    assert '"% Start"' in expression
+
+
+def test_drives_query_renders_values_for_grafana(querier) -> None:
+    query_params = {'number_of_drives': '5', 'car_id': 2, 'before_drive_id': 40}
+
+    expression, params = querier.fetch('postgresql', 'teslamate-car-drives-info', query_params, 'grafana')
+
+    assert params is None
+    assert 'drives.car_id = 2' in expression
+    assert 'drives.id < 40' in expression
+    assert 'LIMIT 5;' in expression
+    assert '"% Start"' in expression
+    assert querier.fetch('postgresql', 'teslamate-car-drives-info', {'car_id': 2}, 'grafana') is None
+
+
+def test_prometheus_engine_reads_vector_series(stub) -> None:
+    stub.prometheus = (200, prometheus_vector(ARGOCD_SERIES))
+    engine = PrometheusClient(f'http://{stub.server_address[0]}:{stub.server_address[1]}/prometheus')
+
+    query_result, cacheable = engine.query('sum(argocd_app_info{}) by (name, namespace, health_status)')
+
+    assert cacheable is True
+    assert query_result == {
+        'series': [
+            {'labels': labels, 'value': float(value)}
+            for labels, value in ARGOCD_SERIES
+        ]
+    }
+
+
+def test_prometheus_engine_reports_errors(stub) -> None:
+    stub.prometheus = (400, {'status': 'error', 'errorType': 'bad_data', 'error': 'parse error'})
+    engine = PrometheusClient(f'http://{stub.server_address[0]}:{stub.server_address[1]}/prometheus')
+
+    query_result, cacheable = engine.query('sum(')
+
+    assert cacheable is False
+    assert query_result == {'error': 'parse error', 'series': []}
+
+
+def test_prometheus_engine_matches_grafana_backend(querier, stub, monkeypatch) -> None:
+    for query_id, series in (('argocd-apps', ARGOCD_SERIES), ('longhorn-usage', LONGHORN_SERIES)):
+        stub.prometheus = (200, prometheus_vector(series))
+        stub.grafana['query'] = grafana_frames(series)
+
+        direct_result = querier.commit('prometheus', query_id)
+
+        with monkeypatch.context() as patch:
+            grafana_result = commit_through_grafana(querier, patch, 'prometheus', query_id)
+
+        assert direct_result['total_items'] > 0
+        assert direct_result == grafana_result
+
+    assert [path for path, _ in stub.requests] == [
+        '/prometheus/api/v1/query',
+        '/api/ds/query',
+        '/prometheus/api/v1/query',
+        '/api/ds/query'
+    ]
+
+
+def fail(expression: str, params: list | None = None) -> tuple[dict, bool]:
+    raise RuntimeError('engine crashed')
+
+
+def commit_car_info_batch(stub) -> tuple[int, dict]:
+    from connectors.grafana.src.api_processor import APIProcessor
+
+    stub.grafana['query-0'] = create_postgresql_engine(*CAR_STATE_ROWS).query('SELECT 1')[0]
+
+    response = APIProcessor.process_batch_request(
+        queries=[
+            {'ds_type': 'postgresql', 'query_id': 'teslamate-car-state', 'params': None},
+            {'ds_type': 'prometheus', 'query_id': 'argocd-apps', 'params': None}
+        ]
+    )
+
+    return response.status_code, json.loads(response.body)
+
+
+def test_direct_engine_failure_falls_back_to_grafana(querier, stub, monkeypatch) -> None:
+    monkeypatch.setattr(querier.engines['prometheus'], 'query', fail)
+    stub.grafana['query'] = grafana_frames(ARGOCD_SERIES)
+
+    result = querier.commit('prometheus', 'argocd-apps')
+
+    assert result['total_items'] == len(ARGOCD_SERIES)
+    assert [path for path, _ in stub.requests] == ['/api/ds/query']
+
+
+def test_direct_engine_error_falls_back_to_grafana(querier, stub) -> None:
+    stub.prometheus = (503, {'status': 'error', 'errorType': 'unavailable', 'error': 'vmselect is down'})
+    stub.grafana['query'] = grafana_frames(LONGHORN_SERIES)
+
+    result = querier.commit('prometheus', 'longhorn-usage')
+
+    assert result['total_items'] > 0
+    assert [path for path, _ in stub.requests] == ['/prometheus/api/v1/query', '/api/ds/query']
+
+
+def test_batch_falls_back_to_grafana_when_direct_engine_fails(querier, stub, monkeypatch) -> None:
+    monkeypatch.setattr(querier.engines['prometheus'], 'query', fail)
+    stub.grafana['query-1'] = grafana_frames(ARGOCD_SERIES)
+
+    status_code, result = commit_car_info_batch(stub)
+
+    assert status_code == 200
+    assert [query['status'] for query in result['queries']] == ['successful', 'successful']
+    assert [path for path, _ in stub.requests] == ['/api/ds/query', '/api/ds/query']
+
+
+def test_batch_reports_partial_result_when_fallback_fails(querier, stub, monkeypatch) -> None:
+    monkeypatch.setattr(querier.engines['prometheus'], 'query', fail)
+
+    status_code, result = commit_car_info_batch(stub)
+
+    assert status_code == 207
+    assert [query['status'] for query in result['queries']] == ['successful', 'failed']
+    assert result['items'][0]['state'] == 'online'
+
+
+def test_batch_runs_direct_queries_concurrently(querier, stub, monkeypatch) -> None:
+    from connectors.grafana.src.api_processor import APIProcessor
+
+    barrier = threading.Barrier(2, timeout=5)
+    series = {'argocd': ARGOCD_SERIES, 'longhorn': LONGHORN_SERIES}
+
+    def query(expression: str, params: list | None = None) -> tuple[dict, bool]:
+        barrier.wait()
+
+        return {
+            'series': [
+                {'labels': labels, 'value': value}
+                for labels, value in series['argocd' if 'argocd' in expression else 'longhorn']
+            ]
+        }, True
+
+    monkeypatch.setattr(querier.engines['prometheus'], 'query', query)
+
+    response = APIProcessor.process_batch_request(
+        queries=[
+            {'ds_type': 'prometheus', 'query_id': 'argocd-apps', 'params': None},
+            {'ds_type': 'prometheus', 'query_id': 'longhorn-usage', 'params': None}
+        ]
+    )
+    result = json.loads(response.body)
+
+    assert response.status_code == 200
+    assert [query['status'] for query in result['queries']] == ['successful', 'successful']
+    assert stub.requests == []
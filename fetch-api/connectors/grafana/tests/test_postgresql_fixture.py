@@ -0,0 +1,108 @@
+import os
+from datetime import datetime
+
+import pytest
+from connectors.grafana.src.postgresql.client import PostgreSQLClient
+
+
+FIXTURE_DSN = os.environ.get('TESLAMATE_FIXTURE_DSN')
+
+EXPECTED_ITEMS = {
+    'teslamate-usable-battery-level': {
+        'usable_battery_percentage': 80,
+        'usable_battery_kwh': 59.06,
+        'usable_battery_km': 268.1
+    },
+    'teslamate-last-charge-info': {
+        'location': 'Business Park Sofia, Sofia',
+        'charge_type': 'AC',
+        'charge_energy_added_kwh': 21.5,
+        'charge_start_percentage': 54,
+        'charge_end_percentage': 88,
+        'charge_energy_added_percentage': 34,
+        'duration': '02:00'
+    },
+    'teslamate-last-seen-location': {
+        'city': 'Sofia',
+        'address': 'Business Park Sofia, Mladost'
+    },
+    'teslamate-car-state': {
+        'state': 'asleep'
+    },
+    'teslamate-car-efficiency': {
+        'average_driving_efficiency_percentage': 69.4,
+        'average_consumption_wh_per_km': 220.3,
+        'full_charge_usable_battery_kwh': 73.34,
+        'full_charge_usable_range_km': 332.9
+    },
+    'teslamate-car-drives-info': {
+        'id': 3,
+        'start_address': 'Home',
+        'end_address': 'Business Park Sofia, Sofia',
+        'duration_minutes': 20,
+        'distance_km': 12.2,
+        'start_battery_percentage': 84,
+        'end_battery_percentage': 81,
+        'outside_temperature_celsius': 18.5,
+        'max_power_kw': 88
+    }
+}
+
+DRIVES_PARAMS = {'number_of_drives': 5, 'car_id': 1}
+
+pytestmark = pytest.mark.skipif(FIXTURE_DSN is None, reason='TESLAMATE_FIXTURE_DSN is not set')
+
+
+
+@pytest.fixture(scope='module')
+def engine():
+    engine = PostgreSQLClient(FIXTURE_DSN)
+    engine.open()
+
+    yield engine
+
+    engine.close()
+
+
+def run_query(querier, engine: PostgreSQLClient, query_id: str, query_params: dict | None = None) -> dict:
+    expression, params = querier.fetch('postgresql', query_id, query_params, 'direct')
+    query_result, cacheable = engine.query(expression, params)
+
+    assert cacheable is True, query_result.get('error')
+
+    return querier.process('postgresql', query_id, {'results': {'query': query_result}})
+
+
+def drive_ids(querier, engine: PostgreSQLClient, **query_params: int) -> list[int]:
+    result = run_query(querier, engine, 'teslamate-car-drives-info', {**DRIVES_PARAMS, **query_params})
+
+    return [item['id'] for item in result['items']]
+
+
+
+def test_fixture_covers_every_query(querier) -> None:
+    assert set(querier.queries['postgresql']) == set(EXPECTED_ITEMS)
+
+
+@pytest.mark.parametrize('query_id', sorted(EXPECTED_ITEMS))
+def test_query_runs_against_fixture(querier, engine, query_id: str) -> None:
+    result = run_query(querier, engine, query_id, DRIVES_PARAMS)
+    item = result['items'][0]
+
+    assert result['total_items'] >= 1
+    assert {key: item[key] for key in EXPECTED_ITEMS[query_id]} == EXPECTED_ITEMS[query_id]
+
+
+def test_drives_query_converts_column_types(querier, engine) -> None:
+    result = run_query(querier, engine, 'teslamate-car-drives-info', DRIVES_PARAMS)
+
+    for item in result['items']:
+        assert isinstance(item['distance_km'], float)
+        assert datetime.fromisoformat(item['start_time']) < datetime.fromisoformat(item['end_time'])
+
+
+def test_drives_query_pages_by_drive_id(querier, engine) -> None:
+    assert drive_ids(querier, engine) == [3, 2, 1]
+    assert drive_ids(querier, engine, after_drive_id=1) == [3, 2]
+    assert drive_ids(querier, engine, before_drive_id=3, number_of_drives=1) == [2]
+    assert drive_ids(querier, engine, car_id=2) == []
@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     name: str = 'connector-ml'
     listen_host: str = '0.0.0.0'
     listen_port: int = 8070
+    listen_keep_alive_seconds: int = 75
 
     url: str
 
@@ -27,6 +28,7 @@ class Settings(BaseSettings):
     health_next_check: str | None = None
     health_last_check: str | None = None
     healthy: bool | None = None
+    model_loaded: bool | None = None
 
     health_check_interval_seconds: int = 180
     health_retry_interval_seconds: int = 15
@@ -36,6 +38,16 @@ class Settings(BaseSettings):
     default_model: str
     default_keep_alive_minutes: int = 15
     default_temperature: float = 0.5
+    default_num_ctx: int = 10200
+    default_num_thread: int = 8
+
+    pool_size: int = 4
+
+    queue_max_concurrency: int = 1
+    queue_max_depth: int = 16
+    queue_interactive_deadline_seconds: float = 30
+    queue_background_deadline_seconds: float = 120
+    warmup_timeout_seconds: int = 300
 
 
     def model_post_init(self, __context: Any) -> None:
@@ -9,6 +9,7 @@ from connectors.ml.settings import settings
 from connectors.ml.src.telemetry.tracing import instrumentor
 from connectors.ml.src.ollama.client import OllamaClient
 from connectors.ml.src.health_checker import HealthChecker
+from connectors.ml.src.model_loader import ModelLoader
 from connectors.ml.src.loaders import RoutesLoader
 
 
@@ -16,6 +17,7 @@ from connectors.ml.src.loaders import RoutesLoader
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     scheduler.start()
     health_checker.create_schedule()
+    model_loader.create_schedule()
 
     RoutesLoader.load(app, settings)
 
@@ -26,6 +28,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
 scheduler = BackgroundScheduler()
 health_checker = HealthChecker(scheduler)
+model_loader = ModelLoader(scheduler)
 ollama_client = OllamaClient()
 
 app = FastAPI(
@@ -0,0 +1,88 @@
+from datetime import datetime
+from apscheduler.schedulers.background import BackgroundScheduler
+from connectors.ml.src.telemetry.logging import log
+from connectors.ml.settings import settings
+
+from common.telemetry.src.tracing.wrappers import traced
+from common.telemetry.src.tracing.helpers import reword
+from connectors.ml.src.ollama.client import OllamaClient
+
+
+
+class ModelLoader:
+    def __init__(self, scheduler: BackgroundScheduler) -> None:
+        self.scheduler = scheduler
+        self.job_id = 'warmup_ollama'
+
+
+    @traced('warm up ollama model')
+    def load(self, span=None) -> None:
+        if settings.model_loaded is True:
+            return None
+
+        started_at = datetime.now()
+
+        try:
+            OllamaClient.load(settings.default_model)
+
+        except Exception as err:
+            settings.model_loaded = False
+
+            log.warning('Unable to load default model into Ollama, retrying', extra={
+                'model': settings.default_model,
+                'retry_interval_seconds': settings.health_retry_interval_seconds,
+                'error': str(err)
+            })
+            span.set_attributes(
+                reword({
+                    'warmup.model': settings.default_model,
+                    'warmup.error.message': str(err),
+                    'warmup.error.type': type(err).__name__,
+                    'warmup.status': settings.model_loaded
+                })
+            )
+
+            return None
+
+        settings.model_loaded = True
+        duration_seconds = round((datetime.now() - started_at).total_seconds(), 1)
+
+        try:
+            self.scheduler.remove_job(self.job_id)
+
+        except:
+            pass
+
+        log.info('Default model loaded into Ollama', extra={
+            'model': settings.default_model,
+            'duration_seconds': duration_seconds
+        })
+        span.set_attributes(
+            reword({
+                'warmup.model': settings.default_model,
+                'warmup.duration.seconds': duration_seconds,
+                'warmup.status': settings.model_loaded
+            })
+        )
+
+
+    @traced('schedule model warm up')
+    def create_schedule(self, span=None) -> None:
+        log.debug(f'Scheduling warm up of {settings.default_model}')
+
+        job = self.scheduler.add_job(
+            self.load,
+            'interval',
+            seconds=settings.health_retry_interval_seconds,
+            next_run_time=datetime.now(),
+            max_instances=1,
+            id=self.job_id
+        )
+
+        span.set_attributes(
+            reword({
+                'scheduler.interval.seconds': settings.health_retry_interval_seconds,
+                'scheduler.job.id': job.id,
+                'warmup.model': settings.default_model
+            })
+        )
@@ -1,6 +1,7 @@
-import requests
+import httpx, requests, threading
+from typing import Iterator
 from langchain_ollama import ChatOllama
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, BaseMessageChunk
 from connectors.ml.settings import settings
 from common.telemetry.src.tracing.wrappers import traced
 from common.telemetry.src.tracing.helpers import reword
@@ -10,6 +11,8 @@ from common.telemetry.src.tracing.helpers import reword
 class OllamaClient:
     def __init__(self) -> None:
         self.url = settings.url
+        self.models = {}
+        self.lock = threading.Lock()
 
 
     @staticmethod
@@ -29,6 +32,73 @@ class OllamaClient:
         return response
 
 
+    @staticmethod
+    @traced('load ollama model')
+    def load(model: str, span=None) -> requests.Response:
+        span.set_attributes({
+            'ollama.operation': 'load',
+            'ollama.url': settings.url,
+            'ollama.model': model,
+            'ollama.keep_alive': f'{settings.default_keep_alive_minutes}m',
+            'ollama.num_ctx': settings.default_num_ctx,
+            'ollama.num_thread': settings.default_num_thread
+        })
+
+        response = requests.post(
+            f'{settings.url}/api/generate',
+            json={
+                'model': model,
+                'keep_alive': f'{settings.default_keep_alive_minutes}m',
+                'options': {
+                    'num_ctx': settings.default_num_ctx,
+                    'num_thread': settings.default_num_thread
+                }
+            },
+            timeout=settings.warmup_timeout_seconds
+        )
+
+        response.raise_for_status()
+
+        return response
+
+
+    @staticmethod
+    def get_messages(prompt: str, instructions: str = '') -> list[dict]:
+        return [
+            {
+                'role': 'system',
+                'content': instructions
+            },
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ]
+
+
+    def get_model(self, model: str, temperature: float, num_ctx: int) -> ChatOllama:
+        key = (model, temperature, num_ctx)
+
+        with self.lock:
+            if not key in self.models:
+                self.models[key] = ChatOllama(
+                    base_url=self.url,
+                    model=model,
+                    keep_alive=f'{settings.default_keep_alive_minutes}m',
+                    temperature=temperature,
+                    num_ctx=num_ctx,
+                    num_thread=settings.default_num_thread,
+                    client_kwargs={
+                        'limits': httpx.Limits(
+                            max_connections=settings.pool_size,
+                            max_keepalive_connections=settings.pool_size
+                        )
+                    }
+                )
+
+            return self.models[key]
+
+
     @traced('ask ollama')
     def ask(self, prompt: str, model: str, instructions: str = '', span=None) -> BaseMessage:
         span.set_attributes(
@@ -39,30 +109,47 @@ class OllamaClient:
                 'ollama.prompt': prompt,
                 'ollama.instructions': instructions,
                 'ollama.keep_alive': f'{settings.default_keep_alive_minutes}m',
-                'ollama.temperature': settings.default_temperature
+                'ollama.temperature': settings.default_temperature,
+                'ollama.num_ctx': settings.default_num_ctx,
+                'ollama.clients': len(self.models)
             })
         )
 
-        model = ChatOllama(
-            base_url=self.url,
+        model = self.get_model(
             model=model,
-            keep_alive=f'{settings.default_keep_alive_minutes}m',
             temperature=settings.default_temperature,
-            num_ctx=10200,
-            num_thread=8
+            num_ctx=settings.default_num_ctx
         )
 
         response = model.invoke(
-            [
-                {
-                    'role': 'system',
-                    'content': instructions
-                },
-                {
-                    'role': 'user',
-                    'content': prompt
-                }
-            ]
+            OllamaClient.get_messages(prompt, instructions)
         )
 
         return response
+
+
+    @traced('stream ollama')
+    def stream(self, prompt: str, model: str, instructions: str = '', span=None) -> Iterator[BaseMessageChunk]:
+        span.set_attributes(
+            reword({
+                'ollama.operation': 'stream',
+                'ollama.url': self.url,
+                'ollama.model': model,
+                'ollama.prompt': prompt,
+                'ollama.instructions': instructions,
+                'ollama.keep_alive': f'{settings.default_keep_alive_minutes}m',
+                'ollama.temperature': settings.default_temperature,
+                'ollama.num_ctx': settings.default_num_ctx,
+                'ollama.clients': len(self.models)
+            })
+        )
+
+        model = self.get_model(
+            model=model,
+            temperature=settings.default_temperature,
+            num_ctx=settings.default_num_ctx
+        )
+
+        return model.stream(
+            OllamaClient.get_messages(prompt, instructions)
+        )
@@ -0,0 +1,168 @@
+import heapq, itertools, threading, time
+from typing import Iterator
+from contextlib import contextmanager
+from connectors.ml.settings import settings
+from connectors.ml.src.telemetry.metrics import meter
+from common.telemetry.src.tracing.wrappers import traced
+
+
+
+queue_depth = meter.create_up_down_counter(
+    name='connector_ml.queue.depth',
+    unit='{request}',
+    description='Inference requests waiting for a free Ollama slot'
+)
+queue_active = meter.create_up_down_counter(
+    name='connector_ml.queue.active',
+    unit='{request}',
+    description='Inference requests currently running against Ollama'
+)
+queue_wait = meter.create_histogram(
+    name='connector_ml.queue.wait',
+    unit='s',
+    description='Time inference requests spent waiting in the queue, by priority and result'
+)
+queue_rejections = meter.create_counter(
+    name='connector_ml.queue.rejections',
+    unit='{request}',
+    description='Inference requests rejected because the queue was full or their deadline passed'
+)
+
+
+
+class QueueRejected(Exception):
+    pass
+
+
+
+class InferenceQueue:
+    priorities = {
+        'interactive': 0,
+        'background': 1
+    }
+
+
+    def __init__(self, max_concurrency: int, max_depth: int) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_depth = max_depth
+
+        self.condition = threading.Condition()
+        self.counter = itertools.count()
+        self.waiting = []
+        self.active = 0
+
+
+    def get_deadline(self, priority: str, deadline_seconds: float | None = None) -> float:
+        if not deadline_seconds is None:
+            return deadline_seconds
+
+        if priority == 'background':
+            return settings.queue_background_deadline_seconds
+
+        return settings.queue_interactive_deadline_seconds
+
+
+    def reject(self, priority: str, reason: str, started_at: float) -> QueueRejected:
+        queue_rejections.add(1, {'priority': priority, 'reason': reason})
+        queue_wait.record(time.monotonic() - started_at, {'priority': priority, 'result': 'rejected'})
+
+        return QueueRejected(f'Inference request rejected, {reason}')
+
+
+    def acquire(self, priority: str = 'interactive', deadline_seconds: float | None = None) -> float:
+        started_at = time.monotonic()
+        deadline = started_at + self.get_deadline(priority, deadline_seconds)
+        entry = (self.priorities[priority], next(self.counter))
+
+        with self.condition:
+            if len(self.waiting) >= self.max_depth:
+                raise self.reject(priority, 'queue is full', started_at)
+
+            heapq.heappush(self.waiting, entry)
+            queue_depth.add(1, {'priority': priority})
+
+            try:
+                while self.active >= self.max_concurrency or self.waiting[0] != entry:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        self.waiting.remove(entry)
+                        heapq.heapify(self.waiting)
+                        self.condition.notify_all()
+
+                        raise self.reject(priority, 'deadline exceeded', started_at)
+
+                    self.condition.wait(remaining)
+
+                heapq.heappop(self.waiting)
+                self.active += 1
+                self.condition.notify_all()
+
+            finally:
+                queue_depth.add(-1, {'priority': priority})
+
+        queue_active.add(1)
+        waited = time.monotonic() - started_at
+        queue_wait.record(waited, {'priority': priority, 'result': 'admitted'})
+
+        return waited
+
+
+    def release(self) -> None:
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+        queue_active.add(-1)
+
+
+    @contextmanager
+    def slot(self, priority: str = 'interactive', deadline_seconds: float | None = None) -> Iterator[float]:
+        waited = self.admit(priority, deadline_seconds)
+
+        try:
+            yield waited
+
+        finally:
+            self.release()
+
+
+    @traced('wait for inference slot')
+    def admit(self, priority: str, deadline_seconds: float | None, span=None) -> float:
+        span.set_attributes({
+            'queue.priority': priority,
+            'queue.deadline.seconds': self.get_deadline(priority, deadline_seconds),
+            'queue.max_concurrency': self.max_concurrency
+        })
+
+        waited = self.acquire(priority, deadline_seconds)
+
+        span.set_attributes({
+            'queue.wait.seconds': round(waited, 3)
+        })
+
+        return waited
+
+
+    def get_stats(self) -> dict:
+        with self.condition:
+            waiting = {
+                priority: len([
+                    entry for entry in self.waiting
+                    if entry[0] == rank
+                ]) for priority, rank in self.priorities.items()
+            }
+
+            return {
+                'max_concurrency': self.max_concurrency,
+                'max_depth': self.max_depth,
+                'active': self.active,
+                'waiting': waiting,
+                'depth': len(self.waiting)
+            }
+
+
+inference_queue = InferenceQueue(
+    max_concurrency=settings.queue_max_concurrency,
+    max_depth=settings.queue_max_depth
+)
@@ -1,5 +1,7 @@
-import os
-from langchain_core.messages import BaseMessage
+import os, json
+from typing import Iterator
+from langchain_core.messages import AIMessage, BaseMessage
+from common.messages.api import client_responses
 from common.utils.system import read_file, render_template
 from common.utils.helpers import TimeUtils
 from common.telemetry.src.tracing.wrappers import traced
@@ -8,6 +10,7 @@ from connectors.ml.settings import settings
 from connectors.ml.src.telemetry.logging import log
 from connectors.ml.src.api import OllamaClient, ollama_client
 from connectors.ml.src.ollama.query_processor import Processor
+from connectors.ml.src.ollama.inference_queue import inference_queue
 
 
 
@@ -69,6 +72,52 @@ class Querier:
             })
 
 
+    def stream(self, prompt: str, model: str | None = None, instructions: str = '', instructions_template: str | None = None, priority: str = 'interactive', deadline_seconds: float | None = None) -> Iterator[str]:
+        with inference_queue.slot(priority, deadline_seconds) as waited:
+            yield Querier.format_chunk('start', {'queue_wait_seconds': round(waited, 3)})
+            yield from self.generate(prompt, model, instructions, instructions_template)
+
+
+    def generate(self, prompt: str, model: str | None, instructions: str, instructions_template: str | None) -> Iterator[str]:
+        try:
+            full_instructions = self.fetch(instructions, instructions_template)
+            payload = self.render(prompt, model, full_instructions)
+            chunks = self.client.stream(*payload.values())
+            content = []
+            response_metadata = {}
+
+            for chunk in chunks:
+                if chunk.response_metadata:
+                    response_metadata = chunk.response_metadata
+
+                if chunk.content:
+                    content.append(chunk.content)
+                    yield Querier.format_chunk('token', {'content': chunk.content})
+
+            result = self.process(
+                AIMessage(
+                    content=''.join(content),
+                    response_metadata=response_metadata
+                )
+            )
+
+            log.info('Streamed query executed successfully')
+
+            yield Querier.format_chunk('done', result)
+
+        except Exception as err:
+            log.error('Streamed query execution failed', extra={
+                'error': str(err)
+            })
+
+            yield Querier.format_chunk('error', client_responses['server-error'])
+
+
+    @staticmethod
+    def format_chunk(event: str, data: dict) -> str:
+        return json.dumps({'event': event, **data}, separators=(',', ':')) + '\n'
+
+
     @traced('fetch instructions')
     def fetch(self, instructions: str, instructions_template: str | None, span=None) -> str:
         if instructions_template:
@@ -18,7 +18,7 @@ class Processor:
         result.append({
             'answer': answer,
             'duration_seconds': round((int(response.response_metadata['total_duration']) / 1_000_000_000), 1),
-            'provider': response.response_metadata['model_provider'],
+            'provider': response.response_metadata.get('model_provider', 'ollama'),
             'model': response.response_metadata['model_name'],
             'temperature': settings.default_temperature
         })
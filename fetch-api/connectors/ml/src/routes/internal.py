@@ -1,4 +1,5 @@
 from connectors.ml.settings import settings
+from connectors.ml.src.ollama.inference_queue import inference_queue
 from fastapi import APIRouter
 
 
@@ -10,6 +11,8 @@ def health() -> dict:
     return {
         'connector_name': settings.name,
         'healthy': settings.healthy,
+        'model': settings.default_model,
+        'model_loaded': settings.model_loaded,
         'health_endpoint': settings.health_endpoint,
         'health_last_check': settings.health_last_check,
         'health_next_check': settings.health_next_check
@@ -19,5 +22,10 @@ def health() -> dict:
 @router.get('/ready', tags=['internal'], summary='Readiness check')
 def ready() -> dict:
     return {
-        'ready': settings.healthy
+        'ready': settings.healthy is True and settings.model_loaded is True
     }
+
+
+@router.get('/queue', tags=['internal'], summary='Inference queue status')
+def queue() -> dict:
+    return inference_queue.get_stats()
@@ -1,8 +1,10 @@
+import itertools
 from common.messages.api import client_responses
 from connectors.ml.src.ollama.querier import querier
+from connectors.ml.src.ollama.inference_queue import QueueRejected, inference_queue
 from connectors.ml.src.telemetry.logging import log
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from connectors.ml.src.schemas.ollama import RequestAsk
 
@@ -11,21 +13,60 @@ router = APIRouter()
 
 
 @router.post('/ask', tags=['ollama'], summary='Ask Ollama models a question')
-def ask_ollama(request: RequestAsk) -> JSONResponse:
-    try:
-        result = querier.commit(
+def ask_ollama(request: RequestAsk) -> Response:
+    if request.stream:
+        chunks = querier.stream(
             prompt=request.prompt,
             model=request.model,
             instructions=request.instructions,
-            instructions_template=request.instructions_template
+            instructions_template=request.instructions_template,
+            priority=request.priority,
+            deadline_seconds=request.deadline_seconds
+        )
+
+        try:
+            first_chunk = next(chunks)
+
+        except QueueRejected as err:
+            log.warning('Query rejected by the inference queue', extra={
+                'priority': request.priority,
+                'error': str(err)
+            })
+
+            return JSONResponse(content=client_responses['server-busy'], status_code=503)
+
+        return StreamingResponse(
+            itertools.chain([first_chunk], chunks),
+            media_type='application/x-ndjson',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            }
         )
 
+    try:
+        with inference_queue.slot(request.priority, request.deadline_seconds):
+            result = querier.commit(
+                prompt=request.prompt,
+                model=request.model,
+                instructions=request.instructions,
+                instructions_template=request.instructions_template
+            )
+
         assert not result is None
 
         log.info('Query executed successfully')
 
         return JSONResponse(content=result, status_code=200)
 
+    except QueueRejected as err:
+        log.warning('Query rejected by the inference queue', extra={
+            'priority': request.priority,
+            'error': str(err)
+        })
+
+        return JSONResponse(content=client_responses['server-busy'], status_code=503)
+
     except Exception as err:
         log.error('Query execution failed', extra={
             'error': str(err)
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from typing import Literal
+from pydantic import BaseModel, Field
 
 
 
@@ -7,3 +8,6 @@ class RequestAsk(BaseModel):
     model: str | None = None
     instructions: str | None = None
     instructions_template: str | None = None
+    stream: bool = False
+    priority: Literal['interactive', 'background'] = 'interactive'
+    deadline_seconds: float | None = Field(None, ge=0)
@@ -0,0 +1,14 @@
+from common.telemetry.meter import Meter
+from connectors.ml.settings import settings
+
+
+instrumentor = Meter(
+    otel_meta={
+        'service_name': settings.otel_service_name,
+        'service_namespace': settings.otel_service_namespace,
+        'service_version': settings.otel_service_version,
+        'otlp_endpoint_grpc': settings.otlp_endpoint_grpc
+    }
+)
+
+meter = instrumentor.get_meter()
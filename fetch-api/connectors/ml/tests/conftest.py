@@ -0,0 +1,10 @@
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+os.environ.update({
+    'URL': 'http://127.0.0.1:1',
+    'DEFAULT_MODEL': 'test',
+    'LOG_LEVEL': 'critical',
+    'OTLP_ENDPOINT_GRPC': 'localhost:4317'
+})
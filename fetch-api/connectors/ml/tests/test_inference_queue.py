@@ -0,0 +1,33 @@
+import time
+
+import pytest
+from connectors.ml.src.ollama.inference_queue import InferenceQueue, QueueRejected
+
+
+
+def test_zero_deadline_admits_when_slot_is_free() -> None:
+    queue = InferenceQueue(max_concurrency=1, max_depth=4)
+
+    with queue.slot('background', 0):
+        assert queue.get_stats()['active'] == 1
+
+    assert queue.get_stats()['active'] == 0
+
+
+def test_zero_deadline_rejects_without_waiting_when_busy() -> None:
+    queue = InferenceQueue(max_concurrency=1, max_depth=4)
+    queue.acquire('interactive')
+    started_at = time.monotonic()
+
+    with pytest.raises(QueueRejected):
+        queue.acquire('background', 0)
+
+    assert time.monotonic() - started_at < 1
+    assert queue.get_stats()['depth'] == 0
+
+
+def test_deadline_defaults_by_priority() -> None:
+    queue = InferenceQueue(max_concurrency=1, max_depth=4)
+
+    assert queue.get_deadline('background', 2.5) == 2.5
+    assert queue.get_deadline('background') > queue.get_deadline('interactive', 0)
@@ -24,6 +24,13 @@ class FetchAPISettings(BaseSettings):
     redis_password: str | None = ''
     redis_cache_ttl: int = 86400
 
+    redis_cache_codec: str = 'json'
+    redis_cache_compression: str = 'zlib'
+    redis_cache_compression_threshold: int = 4096
+
+    redis_l1_cache_max_items: int = 256
+    redis_l1_cache_ttl: int = 30
+
     log_level: str = 'info'
     log_format: str = 'json'
 
@@ -33,12 +40,30 @@ class FetchAPISettings(BaseSettings):
     connector_health_retry_interval_seconds: int = 5
 
     ai_summary_requests_timeout: int = 4
+    ai_summary_async_requests_timeout: int = 300
+    ai_summary_ticket_ttl_seconds: int = 900
+    ai_summary_stream_timeout_seconds: int = 300
+    ai_summary_stream_poll_seconds: float = 1
+    ai_summary_max_workers: int = 2
+    ai_summary_max_pending: int = 8
+    ai_summary_generation_seconds: float = 3
+
+    upstream_max_workers: int = 8
+    upstream_deadline_seconds: int = 10
+
+    background_max_workers: int = 4
+
+    drives_history_max_items: int = 1000
+    drives_history_ttl_seconds: int = 86400
 
 
     def model_post_init(self, __context: Any) -> None:
         if not self.listen_url:
             self.listen_url = f'http://{self.listen_host}:{self.listen_port}'
 
+        if self.redis_l1_cache_ttl > self.redis_cache_ttl:
+            self.redis_l1_cache_ttl = self.redis_cache_ttl
+
         logger.update_settings(
             log_level=self.log_level,
             log_format=self.log_format
@@ -59,8 +84,15 @@ class ConnectorSettings(BaseSettings):
     healthy: bool | None = None
 
     cache: bool = False
+    cache_swr: bool = False
+    cache_swr_fresh_seconds: int = 10
+    cache_swr_stale_seconds: int = 300
     requests_timeout: int = 5
 
+    pool_size: int = 10
+    pool_retries: int = 2
+    pool_keep_alive: bool = True
+
 
     def model_post_init(self, __context: Any) -> None:
         if not self.url:
@@ -8,6 +8,8 @@ from common.utils.helpers import SysUtils
 from fetch_api.settings import (settings, connectors)
 from fetch_api.src.telemetry.tracing import instrumentor
 from fetch_api.src.health_checker import HealthChecker
+from fetch_api.src.executors import (upstream_executor, background_executor, summary_executor)
+from fetch_api.src.registry import ConnectorRegistry
 from fetch_api.src.loaders import RoutesLoader
 
 
@@ -22,11 +24,15 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         )
         health_checkers[connector_name].create_connector_schedule()
 
+    ConnectorRegistry.load()
     RoutesLoader.load(app, settings)
 
     yield
 
     scheduler.shutdown()
+    upstream_executor.shutdown(wait=False, cancel_futures=True)
+    background_executor.shutdown(wait=False, cancel_futures=True)
+    summary_executor.shutdown(wait=False, cancel_futures=True)
 
 
 scheduler = BackgroundScheduler()
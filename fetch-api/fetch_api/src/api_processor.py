@@ -1,16 +1,156 @@
 import json
 from typing import Any
+from concurrent.futures import wait
+from requests import exceptions as ReqExceptions
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from common.messages.api import client_responses
 from common.telemetry.src.tracing.wrappers import traced
 from common.utils.helpers import DataUtils
+from common.utils.concurrency import submit_with_context
 from fetch_api.settings import connectors, settings
 from fetch_api.src.telemetry.logging import log
 from fetch_api.src.client import ConnectorClient
+from fetch_api.src.executors import upstream_executor
+from fetch_api.src.registry import ConnectorRegistry
+from fetch_api.src.summaries import SummaryTickets
 
 
 
 class APIProcessor:
+    @staticmethod
+    def get_queue_deadline(ml_client: ConnectorClient) -> float:
+        return max(ml_client.requests_timeout - settings.ai_summary_generation_seconds, 0)
+
+
+    @staticmethod
+    @traced('fetch upstream')
+    def fetch_upstream(
+        client: ConnectorClient,
+        body: Any,
+        upstream: dict[str, Any],
+        span=None
+    ) -> tuple[list, dict | None, bool, list]:
+        upstream_method = upstream['method']
+        upstream_endpoint = upstream['endpoint']
+        params = upstream.get('params', {})
+
+        span.set_attributes({
+            'processor.upstream.method': upstream_method,
+            'processor.upstream.endpoint': upstream_endpoint
+        })
+
+        if upstream_method == 'GET':
+            response = client.get(
+                endpoint=upstream_endpoint,
+                params=params
+            )
+
+        elif upstream_method == 'POST':
+            response = client.post(
+                endpoint=upstream_endpoint,
+                params=params,
+                data={
+                    **body.model_dump(
+                        exclude={'ai', 'ai_async', 'stream'}
+                    ),
+                    **upstream.get('data', {})
+                }
+            )
+
+        assert response.status_code in (200, 201, 207)
+
+        response_body = response.json()
+        partial = response.status_code == 207
+        cache = None
+
+        if response_body.get('cached') and response_body['cached'] is True:
+            cache = {
+                'cached': True,
+                'cached_at': response_body['cached_at']
+            }
+
+        return response_body['items'], cache, partial, response_body.get('volatile_fields', [])
+
+
+    @staticmethod
+    @traced('process stream')
+    def process_stream(
+        request: Request,
+        body: Any,
+        client: ConnectorClient,
+        upstream: dict[str, Any],
+        span=None
+    ) -> Response:
+        common_log_attributes = {
+            'connector': client.connector_name,
+            'endpoint': request.scope['path'],
+            'upstream_endpoint': upstream['endpoint']
+        }
+
+        span.set_attributes({
+            'processor.upstream.method': 'POST',
+            'processor.upstream.endpoint': upstream['endpoint'],
+            'processor.upstream.stream': True
+        })
+
+        try:
+            chunks = client.stream(
+                endpoint=upstream['endpoint'],
+                data={
+                    **body.model_dump(
+                        exclude={'ai', 'ai_async', 'stream'}
+                    ),
+                    **upstream.get('data', {})
+                }
+            )
+
+        except ReqExceptions.HTTPError as err:
+            log.warning('Upstream stream failed', extra={
+                **common_log_attributes,
+                'status_code': err.response.status_code,
+                'error': str(err)
+            })
+
+            if err.response.status_code == 503:
+                return JSONResponse(
+                    status_code=503,
+                    content=client_responses['server-busy'],
+                    headers={
+                        header: err.response.headers[header]
+                        for header in ['Retry-After']
+                        if header in err.response.headers
+                    }
+                )
+
+            return JSONResponse(
+                status_code=502,
+                content=client_responses['upstream-error']
+            )
+
+        except Exception as err:
+            log.warning('Upstream stream failed', extra={
+                **common_log_attributes,
+                'error': str(err)
+            })
+
+            return JSONResponse(
+                status_code=502,
+                content=client_responses['upstream-error']
+            )
+
+        log.info('Stream started', extra=common_log_attributes)
+
+        return StreamingResponse(
+            chunks,
+            media_type='application/x-ndjson',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+
+
     @staticmethod
     @traced('process request')
     def process_request(
@@ -24,51 +164,52 @@ class APIProcessor:
     ) -> JSONResponse:
         status_code = None
         results = {'total_items': 0, 'items': []}
+        volatile_fields = []
         common_log_attributes = {
             'connector': client.connector_name,
             'endpoint': request.scope['path']
         }
 
-        for upstream in upstreams:
+        futures = [
+            submit_with_context(
+                upstream_executor,
+                upstream.get('fetch', APIProcessor.fetch_upstream),
+                client=client,
+                body=body,
+                upstream=upstream
+            ) for upstream in upstreams
+        ]
+
+        _, pending_futures = wait(
+            futures,
+            timeout=settings.upstream_deadline_seconds
+        )
+
+        for upstream, future in zip(upstreams, futures):
             common_stream_log_attributes = {
                 **common_log_attributes.copy(),
                 'upstream_endpoint': upstream['endpoint']
             }
 
             try:
-                upstream_method = upstream['method']
-                upstream_endpoint = upstream['endpoint']
-                params = upstream.get('params', {})
-
-                if upstream_method == 'GET':
-                    response = client.get(
-                        endpoint=upstream_endpoint,
-                        params=params
-                    )
+                if future in pending_futures:
+                    future.cancel()
+                    raise TimeoutError(f'Deadline of {settings.upstream_deadline_seconds}s exceeded')
 
-                elif upstream_method == 'POST':
-                    response = client.post(
-                        endpoint=upstream_endpoint,
-                        params=params,
-                        data=body.model_dump(
-                            exclude={'ai'}
-                        )
-                    )
+                items, cache, partial, upstream_volatile_fields = future.result()
+                results['items'].extend(items)
+                volatile_fields.extend(upstream_volatile_fields)
+                upstream['status'] = 'failed' if partial else 'success'
 
-                assert response.status_code in (200, 201)
-                
-                response_body = response.json()
-                results['items'].extend(response_body['items'])
-                upstream['status'] = 'success'
-                
-                if response_body.get('cached') and response_body['cached'] is True:
+                if cache:
                     common_stream_log_attributes['cache_status'] = 'hit'
-                    upstream['cache'] = {
-                        'cached': True,
-                        'cached_at': response_body['cached_at']
-                    }
+                    upstream['cache'] = cache
 
-                log.debug('Upstream fetch completed', extra=common_stream_log_attributes)
+                if partial:
+                    log.warning('Upstream fetch partially failed', extra=common_stream_log_attributes)
+
+                else:
+                    log.debug('Upstream fetch completed', extra=common_stream_log_attributes)
 
             except Exception as err:
                 upstream['status'] = 'failed'
@@ -77,63 +218,104 @@ class APIProcessor:
                     'error': str(err)
                 })
 
+        span.set_attributes({
+            'processor.upstreams.total': len(upstreams),
+            'processor.upstreams.failed': len([
+                upstream for upstream in upstreams
+                if upstream['status'] == 'failed'
+            ]),
+            'processor.upstreams.deadline_seconds': settings.upstream_deadline_seconds
+        })
+
+        stable_items = results['items']
+        results['items'] = DataUtils.fill_volatile_data(stable_items, volatile_fields)
+
         if client.connector_name != 'ml':
             if body.ai and len(results['items']) > 0:
                 if 'ml' in connectors:
-                    ml_client = ConnectorClient(
-                        connectors['ml'].name,
-                        cache=True,
-                        requests_timeout=settings.ai_summary_requests_timeout
-                    )
-
                     upstream_ml_endpoint = 'ask'
                     commong_ml_log_attributes = {
                         **common_log_attributes,
                         'upstream_ml_endpoint': upstream_ml_endpoint
                     }
 
-                    try:
-                        response = ml_client.post(
-                            endpoint=upstream_ml_endpoint,
-                            data={
-                                'instructions_template': ai_instructions_template,
-                                'prompt': '{}\n\n\nJSON_DATA: {}'.format(
-                                    ai_prompt,
-                                    json.dumps(
-                                        results['items'],
-                                        separators=(',', ':')
-                                    )
-                                )
-                            },
-                            cache_key=DataUtils.create_cache_key(
-                                connector_name=ml_client.connector_name,
-                                method='POST',
-                                endpoint=upstream_ml_endpoint,
-                                params={},
-                                data=DataUtils.omit_volatile_data(results['items'])
+                    ml_data = {
+                        'priority': 'background',
+                        'instructions_template': ai_instructions_template,
+                        'prompt': '{}\n\n\nJSON_DATA: {}'.format(
+                            ai_prompt,
+                            json.dumps(
+                                results['items'],
+                                separators=(',', ':')
                             )
                         )
+                    }
+                    ml_cache_key = DataUtils.create_cache_key(
+                        connector_name=connectors['ml'].name,
+                        method='POST',
+                        endpoint=upstream_ml_endpoint,
+                        params={},
+                        data=stable_items
+                    )
+
+                    if body.ai_async:
+                        ml_client = ConnectorRegistry.get('ml-summary-async')
+
+                        try:
+                            results['ai_summary'] = SummaryTickets.create(
+                                ml_client=ml_client,
+                                data={
+                                    **ml_data,
+                                    'deadline_seconds': APIProcessor.get_queue_deadline(ml_client)
+                                },
+                                cache_key=ml_cache_key
+                            )
+
+                            log.debug('Scheduled AI summary for upstream responses', extra={
+                                **commong_ml_log_attributes,
+                                'ticket': results['ai_summary']['ticket'],
+                                'ticket_status': results['ai_summary']['status']
+                            })
+
+                        except Exception as err:
+                            log.warning('AI summary scheduling failed', extra={
+                                **commong_ml_log_attributes,
+                                'error': str(err)
+                            })
+
+                    else:
+                        ml_client = ConnectorRegistry.get('ml-summary')
+
+                        try:
+                            response = ml_client.post(
+                                endpoint=upstream_ml_endpoint,
+                                data={
+                                    **ml_data,
+                                    'deadline_seconds': APIProcessor.get_queue_deadline(ml_client)
+                                },
+                                cache_key=ml_cache_key
+                            )
 
-                        assert response.status_code == 200
+                            assert response.status_code == 200
 
-                        response_body = response.json()
-                        results['ai_summary'] = response_body['items'][0]
+                            response_body = response.json()
+                            results['ai_summary'] = {**response_body['items'][0]}
 
-                        if response_body.get('cached') and response_body['cached'] is True:
-                            commong_ml_log_attributes['cache_status'] = 'hit'
-                            results['ai_summary']['cached'] = True
-                            results['ai_summary']['cached_at'] = response_body['cached_at']
+                            if response_body.get('cached') and response_body['cached'] is True:
+                                commong_ml_log_attributes['cache_status'] = 'hit'
+                                results['ai_summary']['cached'] = True
+                                results['ai_summary']['cached_at'] = response_body['cached_at']
 
-                        else:
-                            commong_ml_log_attributes['cache_status'] = 'miss'
+                            else:
+                                commong_ml_log_attributes['cache_status'] = 'miss'
 
-                        log.debug('Fetched AI summary for upstream responses', extra=commong_ml_log_attributes)
+                            log.debug('Fetched AI summary for upstream responses', extra=commong_ml_log_attributes)
 
-                    except Exception as err:
-                        log.warning('AI summary fetch failed', extra={
-                            **commong_ml_log_attributes,
-                            'error': str(err)
-                        })
+                        except Exception as err:
+                            log.warning('AI summary fetch failed', extra={
+                                **commong_ml_log_attributes,
+                                'error': str(err)
+                            })
 
                 else:
                     log.warning('Skipping AI processing, as ML connector is not enabled', extra=common_log_attributes)
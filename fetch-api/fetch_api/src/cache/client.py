@@ -1,68 +1,178 @@
-import json, redis
+import redis, time, threading
 from typing import Any
+from collections import OrderedDict
 from common.telemetry.src.tracing.wrappers import traced
 from common.telemetry.src.tracing.helpers import reword
+from fetch_api.src.telemetry.metrics import meter
+from fetch_api.src.cache.codec import CacheCodec
+
+
+
+cache_requests = meter.create_counter(
+    name='fetch_api.cache.requests',
+    unit='{request}',
+    description='Cache lookups by tier and result'
+)
+cache_evictions = meter.create_counter(
+    name='fetch_api.cache.evictions',
+    unit='{entry}',
+    description='Entries evicted from the in-process cache tier to stay within its size limit'
+)
+cache_items = meter.create_up_down_counter(
+    name='fetch_api.cache.items',
+    unit='{entry}',
+    description='Entries currently held by the in-process cache tier'
+)
+
+
+
+class LocalCache:
+    def __init__(self, max_items: int, ttl: int) -> None:
+        self.max_items = max_items
+        self.ttl = ttl
+
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+
+    def get(self, key: str) -> tuple[bool, bytes | None]:
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return False, None
+
+            expires_at, value = entry
+
+            if expires_at <= time.monotonic():
+                self.entries.pop(key, None)
+                cache_items.add(-1, {'tier': 'l1'})
+                return False, None
+
+            self.entries.move_to_end(key)
+
+            return True, value
+
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        ttl = min(ttl, self.ttl) if ttl else self.ttl
+
+        with self.lock:
+            if not key in self.entries:
+                cache_items.add(1, {'tier': 'l1'})
+
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_items:
+                self.entries.popitem(last=False)
+                cache_items.add(-1, {'tier': 'l1'})
+                cache_evictions.add(1, {'tier': 'l1'})
+
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            if not self.entries.pop(key, None) is None:
+                cache_items.add(-1, {'tier': 'l1'})
 
 
 
 class RedisClient:
-    def __init__(self, host: str, port: int, db: int, password: str | None = None) -> None:
+    def __init__(self, host: str, port: int, db: int, password: str | None = None, l1_max_items: int = 0, l1_ttl: int = 0, codec: CacheCodec | None = None) -> None:
         self.client = redis.Redis(
             host=host,
             port=port,
             db=db,
-            password=password,
-            decode_responses=True
+            password=password
         )
 
+        self.codec = codec or CacheCodec()
+
+        self.l1 = None
+
+        if l1_max_items > 0 and l1_ttl > 0:
+            self.l1 = LocalCache(
+                max_items=l1_max_items,
+                ttl=l1_ttl
+            )
+
 
     def ping(self) -> bool:
         return self.client.ping()
 
 
     @traced('retrieve cache')
-    def get(self, key: str, span=None) -> Any:
-        value = self.client.get(key)
+    def get(self, key: str, l1: bool = True, span=None) -> Any:
         span.set_attributes({
             'redis.cache.key': key
         })
 
+        if l1 and not self.l1 is None:
+            found, value = self.l1.get(key)
+
+            if found:
+                cache_requests.add(1, {'tier': 'l1', 'result': 'hit'})
+                span.set_attributes({
+                    'redis.cache.status': 'hit',
+                    'redis.cache.tier': 'l1',
+                    'redis.cache.size_bytes': len(value)
+                })
+
+                return self.codec.decode(value)
+
+            cache_requests.add(1, {'tier': 'l1', 'result': 'miss'})
+
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.get(key)
+        pipeline.pttl(key)
+        value, ttl_ms = pipeline.execute()
+
         if value is None:
+            cache_requests.add(1, {'tier': 'l2', 'result': 'miss'})
             span.set_attributes({
                 'redis.cache.status': 'miss'
             })
             return None
 
+        cache_requests.add(1, {'tier': 'l2', 'result': 'hit'})
+
         try:
-            json_value = json.loads(value)
+            decoded_value = self.codec.decode(value)
             span.set_attributes(
                 reword({
                     'redis.cache.status': 'hit',
-                    'redis.cache.value': json_value
+                    'redis.cache.tier': 'l2',
+                    'redis.cache.size_bytes': len(value),
+                    'redis.cache.value': decoded_value
                 })
             )
 
-            return json_value
+            if l1 and not self.l1 is None and (ttl_ms > 0 or ttl_ms == -1):
+                self.l1.set(key, value, ttl_ms / 1000 if ttl_ms > 0 else None)
+
+            return decoded_value
 
         except Exception as err:
             span.set_attributes(
                 reword({
                     'redis.cache.status': 'error',
-                    'redis.cache.value': value,
+                    'redis.cache.size_bytes': len(value),
                     'redis.cache.error.message': str(err),
                     'redis.cache.error.type': type(err).__name__
                 })
             )
-            return value
+            return None
 
 
     @traced('update cache')
-    def set(self, key: str, value: Any, ttl: int | None = None, span=None) -> None:
-        encoded_value = json.dumps(value)
+    def set(self, key: str, value: Any, ttl: int | None = None, l1: bool = True, span=None) -> None:
+        encoded_value = self.codec.encode(value)
         span.set_attributes(
             reword({
                 'redis.cache.key': key,
-                'redis.cache.value': encoded_value,
+                'redis.cache.value': value,
+                'redis.cache.size_bytes': len(encoded_value),
+                'redis.cache.codec': f'{self.codec.format}+{self.codec.compression}',
                 'redis.cache.ttl': ttl
             })
         )
@@ -72,3 +182,31 @@ class RedisClient:
         
         else:
             self.client.set(key, encoded_value)
+
+        if l1 and not self.l1 is None:
+            self.l1.set(key, encoded_value, ttl)
+
+
+    @traced('claim cache')
+    def add(self, key: str, value: Any, ttl: int, span=None) -> bool:
+        added = bool(self.client.set(key, self.codec.encode(value), ex=ttl, nx=True))
+
+        span.set_attributes({
+            'redis.cache.key': key,
+            'redis.cache.ttl': ttl,
+            'redis.cache.added': added
+        })
+
+        return added
+
+
+    @traced('delete cache')
+    def delete(self, key: str, span=None) -> None:
+        span.set_attributes({
+            'redis.cache.key': key
+        })
+
+        self.client.delete(key)
+
+        if not self.l1 is None:
+            self.l1.delete(key)
@@ -0,0 +1,129 @@
+import json, zlib, threading
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+
+class CacheCodec:
+    headers = {
+        ('json', 'none'): 0x01,
+        ('json', 'zlib'): 0x02,
+        ('json', 'zstd'): 0x03,
+        ('msgpack', 'none'): 0x04,
+        ('msgpack', 'zlib'): 0x05,
+        ('msgpack', 'zstd'): 0x06
+    }
+    formats = {header: codec for codec, header in headers.items()}
+
+
+    def __init__(self, format: str = 'json', compression: str = 'none', compression_threshold: int = 4096) -> None:
+        self.format = format.lower()
+        self.compression = compression.lower()
+        self.compression_threshold = compression_threshold
+
+        if not (self.format, self.compression) in CacheCodec.headers:
+            raise ValueError(f'Unsupported cache codec {self.format}+{self.compression}')
+
+        if self.format == 'msgpack' and msgpack is None:
+            raise ValueError('msgpack cache codec requires the msgpack package')
+
+        if self.compression == 'zstd' and zstandard is None:
+            raise ValueError('zstd cache compression requires the zstandard package')
+
+        self.zstd = threading.local()
+
+
+    def get_zstd_compressor(self) -> 'zstandard.ZstdCompressor':
+        if not hasattr(self.zstd, 'compressor'):
+            self.zstd.compressor = zstandard.ZstdCompressor()
+
+        return self.zstd.compressor
+
+
+    def get_zstd_decompressor(self) -> 'zstandard.ZstdDecompressor':
+        if not hasattr(self.zstd, 'decompressor'):
+            self.zstd.decompressor = zstandard.ZstdDecompressor()
+
+        return self.zstd.decompressor
+
+
+    @staticmethod
+    def serialize(value: Any, format: str) -> bytes:
+        if format == 'msgpack':
+            return msgpack.packb(value, use_bin_type=True)
+
+        if not orjson is None:
+            return orjson.dumps(value)
+
+        return json.dumps(value, separators=(',', ':')).encode()
+
+
+    @staticmethod
+    def deserialize(raw: bytes, format: str) -> Any:
+        if format == 'msgpack':
+            return msgpack.unpackb(raw, raw=False)
+
+        if not orjson is None:
+            return orjson.loads(raw)
+
+        return json.loads(raw)
+
+
+    def compress(self, raw: bytes, compression: str) -> bytes:
+        if compression == 'zlib':
+            return zlib.compress(raw)
+
+        if compression == 'zstd':
+            return self.get_zstd_compressor().compress(raw)
+
+        return raw
+
+
+    def decompress(self, raw: bytes, compression: str) -> bytes:
+        if compression == 'zlib':
+            return zlib.decompress(raw)
+
+        if compression == 'zstd':
+            return self.get_zstd_decompressor().decompress(raw)
+
+        return raw
+
+
+    def encode(self, value: Any) -> bytes:
+        raw = CacheCodec.serialize(value, self.format)
+        compression = 'none'
+
+        if self.compression != 'none' and len(raw) >= self.compression_threshold:
+            raw = self.compress(raw, self.compression)
+            compression = self.compression
+
+        return bytes([CacheCodec.headers[(self.format, compression)]]) + raw
+
+
+    def decode(self, raw: bytes | str) -> Any:
+        if isinstance(raw, str):
+            raw = raw.encode()
+
+        if len(raw) == 0 or not raw[0] in CacheCodec.formats:
+            return json.loads(raw)
+
+        format, compression = CacheCodec.formats[raw[0]]
+
+        return CacheCodec.deserialize(
+            self.decompress(raw[1:], compression),
+            format
+        )
@@ -16,3 +16,12 @@ class CachedResponse:
             'cached_at': self.cached_at,
             **self._json
         }
+
+
+class StreamedResponse:
+    def __init__(self, status_code: int = 200, json_data: dict | None = None) -> None:
+        self.status_code = status_code
+        self._json = json_data or {}
+
+    def json(self) -> dict:
+        return self._json
@@ -1,57 +1,183 @@
-import requests
-from typing import Any
+import json, requests, threading, time
+from typing import Any, Iterator
 from requests import exceptions as ReqExceptions
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fetch_api.src.cache.client import RedisClient
-from fetch_api.src.cache.data import CachedResponse
+from fetch_api.src.cache.codec import CacheCodec
+from fetch_api.src.cache.data import CachedResponse, StreamedResponse
 from fetch_api.settings import settings, connectors
 from fetch_api.src.telemetry.logging import log
 from common.telemetry.src.tracing.wrappers import traced
 from common.telemetry.src.tracing.helpers import reword
 from common.utils.helpers import TimeUtils, DataUtils
+from common.utils.concurrency import submit_with_context, SingleFlight
+from fetch_api.src.executors import background_executor
+from fetch_api.src.telemetry.metrics import meter
+
+
+
+coalesced_requests = meter.create_counter(
+    name='fetch_api.connector.requests.coalesced',
+    unit='{request}',
+    description='Requests that waited on an identical in-flight connector request instead of calling the upstream'
+)
+
+
+
+class ConnectorSession:
+    sessions = {}
+    lock = threading.Lock()
+
+
+    @staticmethod
+    def create(connector_name: str) -> requests.Session:
+        connector = connectors[connector_name]
+
+        retries = Retry(
+            total=connector.pool_retries,
+            connect=connector.pool_retries,
+            read=0,
+            status=0,
+            backoff_factor=0.2
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=connector.pool_size,
+            max_retries=retries
+        )
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        if not connector.pool_keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
+
+
+    @staticmethod
+    def get(connector_name: str) -> requests.Session:
+        with ConnectorSession.lock:
+            if not connector_name in ConnectorSession.sessions:
+                ConnectorSession.sessions[connector_name] = ConnectorSession.create(connector_name)
+
+            return ConnectorSession.sessions[connector_name]
+
+
+    @staticmethod
+    def get_stats() -> dict:
+        stats = {}
+
+        with ConnectorSession.lock:
+            sessions = dict(ConnectorSession.sessions)
+
+        for connector_name, session in sessions.items():
+            connector = connectors[connector_name]
+            pools = session.get_adapter(connector.url).poolmanager.pools
+            connections_opened = 0
+            requests_sent = 0
+
+            for pool_key in pools.keys():
+                try:
+                    pool = pools[pool_key]
+
+                except KeyError:
+                    continue
+
+                connections_opened += pool.num_connections
+                requests_sent += pool.num_requests
+
+            stats[connector_name] = {
+                'pool_size': connector.pool_size,
+                'pool_retries': connector.pool_retries,
+                'pool_keep_alive': connector.pool_keep_alive,
+                'connections_opened': connections_opened,
+                'requests_sent': requests_sent,
+                'connections_reused': max(requests_sent - connections_opened, 0)
+            }
+
+        return stats
 
 
 
 class ConnectorClient:
-    def __init__(self, connector_name: str, requests_timeout: int = 5, cache: bool = False) -> None:
+    flights = SingleFlight()
+    revalidating = set()
+    revalidating_lock = threading.Lock()
+
+
+    def __init__(self, connector_name: str, requests_timeout: int = 5, cache: bool = False, redis: RedisClient | None = None) -> None:
         self.connector_name = connector_name
-        self.url = connectors[connector_name].url
+        self.connector = connectors[connector_name]
+        self.url = self.connector.url
+        self.session = ConnectorSession.get(connector_name)
         self.requests_timeout = requests_timeout
         self.cache = cache
+        self.cache_swr = cache and self.connector.cache_swr
         self.set_headers()
 
         if self.cache:
-            if any(v is None for v in (
-                settings.redis_host,
-                settings.redis_port,
-                settings.redis_db
-            )):
-                log.critical(
-                    f'{self.connector_name} requires caching configuration, but Redis settings are incomplete', extra={
-                        'connector': self.connector_name,
-                        'required_settings': ['REDIS_HOST', 'REDIS_PORT', 'REDIS_DB'],
-                        'optional_settings': ['REDIS_PASSWORD', 'REDIS_CACHE_TTL']
-                    }
-                )
-                raise SystemExit(1)
-
-            try:
-                self.redis = RedisClient(
-                    host=settings.redis_host,
-                    port=settings.redis_port,
-                    db=settings.redis_db,
-                    password=settings.redis_password
-                )
-                self.redis.ping()
-
-            except Exception as err:
-                log.critical(
-                    f'{self.connector_name} failed to connect to Redis: {str(err)}', extra={
-                        'connector': self.connector_name,
-                        'required_settings': ['REDIS_HOST', 'REDIS_PORT', 'REDIS_DB'],
-                        'optional_settings': ['REDIS_PASSWORD', 'REDIS_CACHE_TTL']
-                    }
-                )
-                raise SystemExit(1)
+            self.redis = redis or ConnectorClient.create_redis(connector_name)
+
+
+    @staticmethod
+    def create_redis(connector_name: str) -> RedisClient:
+        if any(v is None for v in (
+            settings.redis_host,
+            settings.redis_port,
+            settings.redis_db
+        )):
+            log.critical(
+                f'{connector_name} requires caching configuration, but Redis settings are incomplete', extra={
+                    'connector': connector_name,
+                    'required_settings': ['REDIS_HOST', 'REDIS_PORT', 'REDIS_DB'],
+                    'optional_settings': ['REDIS_PASSWORD', 'REDIS_CACHE_TTL', 'REDIS_L1_CACHE_MAX_ITEMS', 'REDIS_L1_CACHE_TTL']
+                }
+            )
+            raise SystemExit(1)
+
+        try:
+            codec = CacheCodec(
+                format=settings.redis_cache_codec,
+                compression=settings.redis_cache_compression,
+                compression_threshold=settings.redis_cache_compression_threshold
+            )
+
+        except ValueError as err:
+            log.critical(
+                f'{connector_name} has an invalid cache codec configuration: {str(err)}', extra={
+                    'connector': connector_name,
+                    'redis_cache_codec': settings.redis_cache_codec,
+                    'redis_cache_compression': settings.redis_cache_compression
+                }
+            )
+            raise SystemExit(1)
+
+        try:
+            redis = RedisClient(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password,
+                l1_max_items=settings.redis_l1_cache_max_items,
+                l1_ttl=settings.redis_l1_cache_ttl,
+                codec=codec
+            )
+            redis.ping()
+
+        except Exception as err:
+            log.critical(
+                f'{connector_name} failed to connect to Redis: {str(err)}', extra={
+                    'connector': connector_name,
+                    'required_settings': ['REDIS_HOST', 'REDIS_PORT', 'REDIS_DB'],
+                    'optional_settings': ['REDIS_PASSWORD', 'REDIS_CACHE_TTL', 'REDIS_L1_CACHE_MAX_ITEMS', 'REDIS_L1_CACHE_TTL']
+                }
+            )
+            raise SystemExit(1)
+
+        return redis
 
 
     def set_headers(self) -> None:
@@ -71,7 +197,7 @@ class ConnectorClient:
             'connector.operation': 'ping'
         })
 
-        response = requests.get(
+        response = ConnectorSession.get(connector_name).get(
             health_endpoint,
             timeout=5
         )
@@ -80,193 +206,220 @@ class ConnectorClient:
 
 
     @traced('GET /:connector')
-    def get(self, endpoint: str, params: dict | None = None, data: dict | None = None, cache_key: tuple | None = None, span=None) -> Any:
-        params = params or {}
+    def get(self, endpoint: str, params: dict | None = None, data: dict | None = None, cache_key: str | None = None, span=None) -> Any:
+        return self.request('GET', endpoint, params, data, cache_key, span=span)
+
+
+    @traced('POST /:connector')
+    def post(self, endpoint: str, params: dict | None = None, data: dict | None = None, cache_key: str | None = None, span=None) -> Any:
+        return self.request('POST', endpoint, params, data, cache_key, span=span)
+
+
+    @traced('STREAM /:connector')
+    def stream(self, endpoint: str, data: dict | None = None, cache_key: str | None = None, span=None) -> Iterator[bytes]:
         data = data or {}
 
         span.set_attributes(
             reword({
                 'connector.name': self.connector_name,
-                'connector.method': 'GET',
-                'connector.request.params': params,
+                'connector.method': 'POST',
                 'connector.request.body': data,
                 'connector.url': self.url,
                 'connector.endpoint': endpoint,
-                'connector.cache.enabled': self.cache
+                'connector.cache.enabled': self.cache,
+                'connector.stream': True
             })
         )
 
-        cached_value = None
+        if cache_key is None:
+            cache_key = DataUtils.create_cache_key(
+                connector_name=self.connector_name,
+                method='POST',
+                endpoint=endpoint,
+                params={},
+                data=data
+            )
 
         if self.cache:
-            if cache_key is None:
-                cache_key = DataUtils.create_cache_key(
-                    connector_name=self.connector_name,
-                    method='GET',
-                    endpoint=endpoint,
-                    params=params,
-                    data=data
-                )
-
             cached_value = self.redis.get(cache_key)
 
+            if not cached_value is None and cached_value['status_code'] == 200:
+                response = self.serve_cache(cache_key, cached_value, 'hit', span=span)
+
+                return iter([
+                    ConnectorClient.format_chunk('done', response.json())
+                ])
+
+        response = self.session.post(
+            f'{self.url}/{endpoint}',
+            headers={
+                **self.headers,
+                'Accept': 'application/x-ndjson'
+            },
+            json={
+                **data,
+                'stream': True
+            },
+            timeout=self.requests_timeout,
+            stream=True
+        )
+
+        span.set_attributes({
+            'connector.cache.key': cache_key,
+            'connector.response.status_code': response.status_code
+        })
+
+        if response.status_code != 200:
+            response.close()
+            raise ReqExceptions.HTTPError(f'{self.connector_name} responded with {response.status_code}', response=response)
+
+        return self.relay(response, cache_key)
+
+
+    def relay(self, response: requests.Response, cache_key: str) -> Iterator[bytes]:
         try:
-            response = requests.get(
-                f'{self.url}/{endpoint}',
-                headers=self.headers,
-                params=params,
-                json=data,
-                timeout=self.requests_timeout
-            )
+            for line in response.iter_lines():
+                if not line:
+                    continue
 
-            if response.status_code in [200, 201]:
-                if self.cache:
-                    self.redis.set(
-                        cache_key,
-                        {
-                            'cached_at': TimeUtils.time_now(),
-                            'status_code': response.status_code,
-                            'json': response.json()
-                        },
-                        ttl=settings.redis_cache_ttl
-                    )
+                yield line + b'\n'
 
-                    span.set_attributes({
-                        'connector.cache.updated': True,
-                        'connector.cache.updated_at': TimeUtils.time_now(),
-                        'connector.cache.key': cache_key
-                    })
+                if not self.cache:
+                    continue
 
-            else:
-                if self.cache and not cached_value is None:
-                    span.set_attributes({
-                        'connector.cache.status': 'hit',
-                        'connector.cache.updated': False,
-                        'connector.cache.key': cache_key,
-                        'connector.cache.cached_at': cached_value['cached_at']
-                    })
-
-                    return CachedResponse(
-                        cached_at=cached_value['cached_at'],
-                        status_code=cached_value['status_code'],
-                        json_data=cached_value['json']
-                    )
-                
-            return response
+                try:
+                    result = json.loads(line)
 
-        except ReqExceptions.RequestException as err:
-            if self.cache and not cached_value is None:
-                span.set_attributes({
-                    'connector.cache.status': 'hit',
-                    'connector.cache.updated': False,
-                    'connector.cache.key': cache_key,
-                    'connector.cache.cached_at': cached_value['cached_at']
-                })
+                except ValueError:
+                    continue
 
-                return CachedResponse(
-                    cached_at=cached_value['cached_at'],
-                    status_code=cached_value['status_code'],
-                    json_data=cached_value['json']
-                )
+                if isinstance(result, dict) and result.get('event') == 'done':
+                    result.pop('event')
 
-            span.set_attributes({
-                'connector.cache.enabled': self.cache,
-                'connector.error.message': str(err),
-                'connector.error.type': type(err).__name__
-            })
+                    submit_with_context(
+                        background_executor,
+                        self.write_cache,
+                        cache_key=cache_key,
+                        response=StreamedResponse(json_data=result)
+                    )
 
-            raise err
+        finally:
+            response.close()
 
 
-    @traced('POST /:connector')
-    def post(self, endpoint: str, params: dict | None = None, data: dict | None = None, cache_key: tuple | None = None, span=None) -> Any:
+    @staticmethod
+    def format_chunk(event: str, data: dict) -> bytes:
+        return json.dumps({'event': event, **data}, separators=(',', ':')).encode() + b'\n'
+
+
+    def request(self, method: str, endpoint: str, params: dict | None = None, data: dict | None = None, cache_key: str | None = None, span=None) -> Any:
         params = params or {}
-        data = data or {}        
+        data = data or {}
 
         span.set_attributes(
             reword({
                 'connector.name': self.connector_name,
-                'connector.method': 'POST',
+                'connector.method': method,
                 'connector.request.params': params,
                 'connector.request.body': data,
                 'connector.url': self.url,
                 'connector.endpoint': endpoint,
-                'connector.cache.enabled': self.cache
+                'connector.cache.enabled': self.cache,
+                'connector.cache.swr': self.cache_swr
             })
         )
 
-        cached_value = None
+        if cache_key is None:
+            cache_key = DataUtils.create_cache_key(
+                connector_name=self.connector_name,
+                method=method,
+                endpoint=endpoint,
+                params=params,
+                data=data
+            )
 
-        if self.cache:
-            if cache_key is None:
-                cache_key = DataUtils.create_cache_key(
-                    connector_name=self.connector_name,
-                    method='POST',
-                    endpoint=endpoint,
-                    params=params,
-                    data=data
-                )
+        try:
+            response, shared, waiters = ConnectorClient.flights.do(
+                (self.connector_name, self.requests_timeout, cache_key),
+                self.fetch,
+                method,
+                endpoint,
+                params,
+                data,
+                cache_key,
+                wait_timeout=self.requests_timeout,
+                span=span
+            )
+
+        except TimeoutError as err:
+            cached_response = self.fallback(cache_key, self.redis.get(cache_key) if self.cache else None, span=span)
 
+            span.set_attributes({
+                'connector.coalesced': True,
+                'connector.coalesced.timeout': True
+            })
+
+            if not cached_response is None:
+                return cached_response
+
+            span.set_attributes({
+                'connector.error.message': str(err),
+                'connector.error.type': type(err).__name__
+            })
+
+            raise ReqExceptions.Timeout(str(err)) from err
+
+        span.set_attributes({
+            'connector.coalesced': shared,
+            'connector.coalesced.waiters': waiters
+        })
+
+        if shared:
+            coalesced_requests.add(1, {
+                'connector': self.connector_name,
+                'endpoint': endpoint
+            })
+
+        return response
+
+
+    def fetch(self, method: str, endpoint: str, params: dict, data: dict, cache_key: str, span=None) -> Any:
+        cached_value = None
+
+        if self.cache_swr:
             cached_value = self.redis.get(cache_key)
 
+        if not cached_value is None:
+            cached_age = time.time() - cached_value.get('cached_ts', 0)
+
+            if cached_age < self.connector.cache_swr_fresh_seconds:
+                return self.serve_cache(cache_key, cached_value, 'fresh', span=span)
+
+            if cached_age < (self.connector.cache_swr_fresh_seconds + self.connector.cache_swr_stale_seconds):
+                self.revalidate(method, endpoint, params, data, cache_key)
+                return self.serve_cache(cache_key, cached_value, 'stale', span=span)
+
         try:
-            response = requests.post(
-                f'{self.url}/{endpoint}',
-                headers=self.headers,
-                params=params,
-                json=data,
-                timeout=self.requests_timeout
-            )
+            response = self.send(method, endpoint, params, data)
 
             if response.status_code in [200, 201]:
                 if self.cache:
-                    self.redis.set(
-                        cache_key,
-                        {
-                            'cached_at': TimeUtils.time_now(),
-                            'status_code': response.status_code,
-                            'json': response.json()
-                        },
-                        ttl=settings.redis_cache_ttl
-                    )
+                    self.schedule_cache_update(cache_key, response, span=span)
 
-                    span.set_attributes({
-                        'connector.cache.updated': True,
-                        'connector.cache.updated_at': TimeUtils.time_now(),
-                        'connector.cache.key': cache_key
-                    })
+                return response
+
+            cached_response = self.fallback(cache_key, cached_value, span=span)
+
+            if not cached_response is None:
+                return cached_response
 
-            else:
-                if self.cache and not cached_value is None:
-                    span.set_attributes({
-                        'connector.cache.status': 'hit',
-                        'connector.cache.updated': False,
-                        'connector.cache.key': cache_key,
-                        'connector.cache.cached_at': cached_value['cached_at']
-                    })
-
-                    return CachedResponse(
-                        cached_at=cached_value['cached_at'],
-                        status_code=cached_value['status_code'],
-                        json_data=cached_value['json']
-                    )
-                
             return response
 
         except ReqExceptions.RequestException as err:
-            if self.cache and not cached_value is None:
-                span.set_attributes({
-                    'connector.cache.status': 'hit',
-                    'connector.cache.updated': False,
-                    'connector.cache.key': cache_key,
-                    'connector.cache.cached_at': cached_value['cached_at']
-                })
+            cached_response = self.fallback(cache_key, cached_value, span=span)
 
-                return CachedResponse(
-                    cached_at=cached_value['cached_at'],
-                    status_code=cached_value['status_code'],
-                    json_data=cached_value['json']
-                )
+            if not cached_response is None:
+                return cached_response
 
             span.set_attributes({
                 'connector.cache.enabled': self.cache,
@@ -275,3 +428,157 @@ class ConnectorClient:
             })
 
             raise err
+
+
+    def fallback(self, cache_key: str, cached_value: dict | None, span=None) -> CachedResponse | None:
+        if not self.cache:
+            return None
+
+        if cached_value is None and not self.cache_swr:
+            cached_value = self.redis.get(cache_key)
+
+        if cached_value is None:
+            return None
+
+        return self.serve_cache(cache_key, cached_value, 'hit', span=span)
+
+
+    def send(self, method: str, endpoint: str, params: dict, data: dict) -> requests.Response:
+        return self.session.request(
+            method,
+            f'{self.url}/{endpoint}',
+            headers=self.headers,
+            params=params,
+            json=data,
+            timeout=self.requests_timeout
+        )
+
+
+    def update_cache(self, cache_key: str, response: requests.Response, span=None) -> None:
+        cached_at = TimeUtils.time_now()
+
+        self.redis.set(
+            cache_key,
+            {
+                'cached_at': cached_at,
+                'cached_ts': time.time(),
+                'status_code': response.status_code,
+                'json': response.json()
+            },
+            ttl=settings.redis_cache_ttl
+        )
+
+        span.set_attributes({
+            'connector.cache.updated': True,
+            'connector.cache.updated_at': cached_at,
+            'connector.cache.key': cache_key
+        })
+
+
+    def schedule_cache_update(self, cache_key: str, response: requests.Response, span=None) -> None:
+        span.set_attributes({
+            'connector.cache.updated': True,
+            'connector.cache.update_mode': 'background',
+            'connector.cache.key': cache_key
+        })
+
+        submit_with_context(
+            background_executor,
+            self.write_cache,
+            cache_key=cache_key,
+            response=response
+        )
+
+
+    @traced('write cache')
+    def write_cache(self, cache_key: str, response: requests.Response, span=None) -> None:
+        span.set_attributes({
+            'connector.name': self.connector_name,
+            'connector.cache.key': cache_key
+        })
+
+        try:
+            self.update_cache(cache_key, response, span=span)
+
+        except Exception as err:
+            log.warning('Background cache update failed', extra={
+                'connector': self.connector_name,
+                'cache_key': cache_key,
+                'error': str(err)
+            })
+            span.set_attributes({
+                'connector.cache.updated': False,
+                'connector.error.message': str(err),
+                'connector.error.type': type(err).__name__
+            })
+
+
+    def serve_cache(self, cache_key: str, cached_value: dict, status: str, span=None) -> CachedResponse:
+        span.set_attributes({
+            'connector.cache.status': status,
+            'connector.cache.updated': False,
+            'connector.cache.key': cache_key,
+            'connector.cache.cached_at': cached_value['cached_at']
+        })
+
+        return CachedResponse(
+            cached_at=cached_value['cached_at'],
+            status_code=cached_value['status_code'],
+            json_data=cached_value['json']
+        )
+
+
+    def revalidate(self, method: str, endpoint: str, params: dict, data: dict, cache_key: str) -> None:
+        with ConnectorClient.revalidating_lock:
+            if cache_key in ConnectorClient.revalidating:
+                return None
+
+            ConnectorClient.revalidating.add(cache_key)
+
+        submit_with_context(
+            background_executor,
+            self.refresh_cache,
+            method=method,
+            endpoint=endpoint,
+            params=params,
+            data=data,
+            cache_key=cache_key
+        )
+
+
+    @traced('revalidate cache')
+    def refresh_cache(self, method: str, endpoint: str, params: dict, data: dict, cache_key: str, span=None) -> None:
+        span.set_attributes({
+            'connector.name': self.connector_name,
+            'connector.method': method,
+            'connector.endpoint': endpoint,
+            'connector.cache.key': cache_key
+        })
+
+        try:
+            response = self.send(method, endpoint, params, data)
+
+            if response.status_code in [200, 201]:
+                self.update_cache(cache_key, response, span=span)
+
+            else:
+                span.set_attributes({
+                    'connector.cache.updated': False,
+                    'connector.response.status_code': response.status_code
+                })
+
+        except Exception as err:
+            log.warning('Background cache revalidation failed', extra={
+                'connector': self.connector_name,
+                'endpoint': endpoint,
+                'error': str(err)
+            })
+            span.set_attributes({
+                'connector.cache.updated': False,
+                'connector.error.message': str(err),
+                'connector.error.type': type(err).__name__
+            })
+
+        finally:
+            with ConnectorClient.revalidating_lock:
+                ConnectorClient.revalidating.discard(cache_key)
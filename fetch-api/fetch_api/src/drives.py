@@ -0,0 +1,180 @@
+from typing import Any
+from fetch_api.settings import settings
+from fetch_api.src.client import ConnectorClient
+from fetch_api.src.registry import ConnectorRegistry
+from fetch_api.src.api_processor import APIProcessor
+from fetch_api.src.telemetry.logging import log
+from common.telemetry.src.tracing.wrappers import traced
+
+
+
+class DriveHistory:
+    @staticmethod
+    def get_key(car_id: int) -> str:
+        return f'drives:car:{car_id}'
+
+
+    @staticmethod
+    def get_cursor(drives: list[dict]) -> int | None:
+        if len(drives) == 0:
+            return None
+
+        incomplete_ids = [
+            drive['id'] for drive in drives
+            if drive.get('end_time') in (None, 'N/A')
+        ]
+
+        if len(incomplete_ids) > 0:
+            return min(incomplete_ids) - 1
+
+        return drives[0]['id']
+
+
+    @staticmethod
+    def is_stored(drives: list[dict], updates: list[dict], cursor: int) -> bool:
+        stored = {
+            drive['id']: drive for drive in drives
+            if drive['id'] > cursor
+        }
+
+        return stored == {drive['id']: drive for drive in updates}
+
+
+    @staticmethod
+    def merge(drives: list[dict], updates: list[dict], cursor: int | None = None) -> list[dict]:
+        merged = {
+            drive['id']: drive for drive in drives
+            if not cursor is None and drive['id'] <= cursor
+        }
+
+        for drive in updates:
+            merged[drive['id']] = drive
+
+        return sorted(
+            merged.values(),
+            key=lambda drive: drive['id'],
+            reverse=True
+        )[:settings.drives_history_max_items]
+
+
+    @staticmethod
+    def load(car_id: int) -> dict | None:
+        redis = ConnectorRegistry.get_redis()
+
+        if redis is None:
+            return None
+
+        try:
+            return redis.get(DriveHistory.get_key(car_id), l1=False)
+
+        except Exception as err:
+            log.warning('Unable to load cached drives history', extra={
+                'car_id': car_id,
+                'error': str(err)
+            })
+            return None
+
+
+    @staticmethod
+    def save(car_id: int, history: dict) -> None:
+        redis = ConnectorRegistry.get_redis()
+
+        if redis is None:
+            return
+
+        try:
+            redis.set(
+                DriveHistory.get_key(car_id),
+                history,
+                ttl=settings.drives_history_ttl_seconds,
+                l1=False
+            )
+
+        except Exception as err:
+            log.warning('Unable to save drives history', extra={
+                'car_id': car_id,
+                'error': str(err)
+            })
+
+
+    @staticmethod
+    @traced('fetch drives history')
+    def fetch(
+        client: ConnectorClient,
+        body: Any,
+        upstream: dict[str, Any],
+        span=None
+    ) -> tuple[list, dict | None, bool, list]:
+        number_of_drives = upstream['params']['number_of_drives']
+        car_id = upstream['params']['car_id']
+        history = DriveHistory.load(car_id) or {'drives': [], 'exhausted': False}
+        drives = history['drives']
+        cursor = None
+
+        if len(drives) >= number_of_drives or (history['exhausted'] and len(drives) > 0):
+            cursor = DriveHistory.get_cursor(drives)
+
+        span.set_attributes({
+            'drives.history.car_id': car_id,
+            'drives.history.cached': len(drives),
+            'drives.history.requested': number_of_drives,
+            'drives.history.incremental': not cursor is None
+        })
+
+        if not cursor is None:
+            items, cache, partial, volatile_fields = APIProcessor.fetch_upstream(
+                client=client,
+                body=body,
+                upstream={
+                    **upstream,
+                    'params': {
+                        **upstream['params'],
+                        'after_drive_id': cursor
+                    }
+                }
+            )
+
+            span.set_attributes({
+                'drives.history.cursor': cursor,
+                'drives.history.fetched': len(items)
+            })
+
+            if partial:
+                return items, cache, partial, volatile_fields
+
+            if len(items) >= number_of_drives:
+                drives = DriveHistory.merge([], items)
+                history['exhausted'] = False
+
+            elif DriveHistory.is_stored(drives, items, cursor):
+                span.set_attributes({'drives.history.saved': False})
+
+                return drives[:number_of_drives], cache, partial, volatile_fields
+
+            else:
+                drives = DriveHistory.merge(drives, items, cursor)
+
+            if len(drives) >= number_of_drives or history['exhausted']:
+                DriveHistory.save(car_id, {
+                    'drives': drives,
+                    'exhausted': history['exhausted']
+                })
+                span.set_attributes({'drives.history.saved': True})
+
+                return drives[:number_of_drives], cache, partial, volatile_fields
+
+            span.set_attributes({'drives.history.refilled': True})
+
+        items, cache, partial, volatile_fields = APIProcessor.fetch_upstream(
+            client=client,
+            body=body,
+            upstream=upstream
+        )
+
+        if not partial:
+            DriveHistory.save(car_id, {
+                'drives': DriveHistory.merge([], items),
+                'exhausted': len(items) < number_of_drives
+            })
+
+        return items, cache, partial, volatile_fields
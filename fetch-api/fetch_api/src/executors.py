@@ -0,0 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
+from fetch_api.settings import settings
+
+
+upstream_executor = ThreadPoolExecutor(
+    max_workers=settings.upstream_max_workers,
+    thread_name_prefix='upstream'
+)
+
+background_executor = ThreadPoolExecutor(
+    max_workers=settings.background_max_workers,
+    thread_name_prefix='background'
+)
+
+summary_executor = ThreadPoolExecutor(
+    max_workers=settings.ai_summary_max_workers,
+    thread_name_prefix='summary'
+)
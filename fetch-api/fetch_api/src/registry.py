@@ -0,0 +1,69 @@
+from fetch_api.settings import settings, connectors
+from fetch_api.src.client import ConnectorClient
+from fetch_api.src.cache.client import RedisClient
+from fetch_api.src.telemetry.logging import log
+
+
+
+class ConnectorRegistry:
+    clients = {}
+    redis = None
+
+
+    @staticmethod
+    def load() -> None:
+        if 'ml' in connectors or any(connectors[connector_name].cache for connector_name in connectors):
+            ConnectorRegistry.redis = ConnectorClient.create_redis(','.join(connectors))
+
+        for connector_name in connectors:
+            ConnectorRegistry.register(
+                connector_name,
+                ConnectorClient(
+                    connector_name,
+                    cache=connectors[connector_name].cache,
+                    requests_timeout=connectors[connector_name].requests_timeout,
+                    redis=ConnectorRegistry.redis
+                )
+            )
+
+        if 'ml' in connectors:
+            ConnectorRegistry.register(
+                'ml-summary',
+                ConnectorClient(
+                    connectors['ml'].name,
+                    cache=True,
+                    requests_timeout=settings.ai_summary_requests_timeout,
+                    redis=ConnectorRegistry.redis
+                )
+            )
+
+            ConnectorRegistry.register(
+                'ml-summary-async',
+                ConnectorClient(
+                    connectors['ml'].name,
+                    cache=True,
+                    requests_timeout=settings.ai_summary_async_requests_timeout,
+                    redis=ConnectorRegistry.redis
+                )
+            )
+
+
+    @staticmethod
+    def register(client_name: str, client: ConnectorClient) -> None:
+        ConnectorRegistry.clients[client_name] = client
+
+        log.debug(f'Registered connector client {client_name}', extra={
+            'connector': client.connector_name,
+            'cache': client.cache,
+            'requests_timeout': client.requests_timeout
+        })
+
+
+    @staticmethod
+    def get(client_name: str) -> ConnectorClient:
+        return ConnectorRegistry.clients[client_name]
+
+
+    @staticmethod
+    def get_redis() -> RedisClient | None:
+        return ConnectorRegistry.redis
@@ -1,17 +1,12 @@
-from fetch_api.settings import connectors
-from fetch_api.src.client import ConnectorClient
+from fetch_api.src.registry import ConnectorRegistry
 from fetch_api.src.api_processor import APIProcessor
+from fetch_api.src.drives import DriveHistory
 from fastapi import APIRouter, Request, Query
 from fastapi.responses import JSONResponse
 from fetch_api.src.schemas.grafana import GrafanaBody
 
 
 router = APIRouter()
-client = ConnectorClient(
-    connectors['grafana'].name,
-    cache=connectors['grafana'].cache,
-    requests_timeout=connectors['grafana'].requests_timeout
-)
 
 
 @router.post('/argocd-apps', tags=['connector-grafana'], summary='Fetch ArgoCD applications and their statuses')
@@ -22,7 +17,7 @@ def fetch_argocd_apps(
     return APIProcessor.process_request(
         request=request,
         body=body,
-        client=client,
+        client=ConnectorRegistry.get('grafana'),
         upstreams=[{
             'method': 'GET',
             'endpoint':'prometheus/argocd-apps'
@@ -40,19 +35,25 @@ def fetch_car_info(
     return APIProcessor.process_request(
         request=request,
         body=body,
-        client=client,
-        upstreams=[
-            {
-                'method': 'GET',
-                'endpoint': endpoint
-            } for endpoint in [
-                'postgresql/car-battery',
-                'postgresql/car-last-charge',
-                'postgresql/car-last-location',
-                'postgresql/car-state',
-                'postgresql/car-efficiency'
-            ]
-        ],
+        client=ConnectorRegistry.get('grafana'),
+        upstreams=[{
+            'method': 'POST',
+            'endpoint': 'batch',
+            'data': {
+                'queries': [
+                    {
+                        'ds_type': 'postgresql',
+                        'query_id': query_id
+                    } for query_id in [
+                        'teslamate-usable-battery-level',
+                        'teslamate-last-charge-info',
+                        'teslamate-last-seen-location',
+                        'teslamate-car-state',
+                        'teslamate-car-efficiency'
+                    ]
+                ]
+            }
+        }],
         ai_prompt='Give me a summary for my Tesla.',
         ai_instructions_template='default'
     )
@@ -62,18 +63,21 @@ def fetch_car_info(
 def fetch_car_drives_history(
     request: Request,
     body: GrafanaBody,
-    number_of_drives: int = Query(5, ge=1, le=1000, description='How many recent drive records to fetch')
+    number_of_drives: int = Query(5, ge=1, le=1000, description='How many recent drive records to fetch'),
+    car_id: int = Query(1, ge=1, description='Teslamate id of the car to fetch drives for')
 ) -> JSONResponse:
     return APIProcessor.process_request(
         request=request,
         body=body,
-        client=client,
+        client=ConnectorRegistry.get('grafana'),
         upstreams=[{
             'method': 'GET',
             'endpoint':'postgresql/car-drives-history',
             'params': {
-                'number_of_drives': number_of_drives
-            }
+                'number_of_drives': number_of_drives,
+                'car_id': car_id
+            },
+            'fetch': DriveHistory.fetch
         }],
         ai_prompt=f'Now analyze the data below for these {number_of_drives} drives.',
         ai_instructions_template='car-drives-history'
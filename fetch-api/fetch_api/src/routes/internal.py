@@ -1,4 +1,5 @@
 from fetch_api.settings import (settings, connectors)
+from fetch_api.src.client import ConnectorSession
 from fastapi import APIRouter
 
 
@@ -23,7 +24,10 @@ def health() -> dict:
 
 @router.get('/settings', tags=['internal'], summary='Show fetch-api settings')
 def read_settings() -> dict:
-    return {'settings': settings.model_dump()}
+    return {
+        'settings': settings.model_dump(),
+        'connection_pools': ConnectorSession.get_stats()
+    }
 
 
 @router.get('/connectors', tags=['internal'], summary='Show connectors` settings')
@@ -1,30 +1,61 @@
-from fetch_api.settings import connectors
-from fetch_api.src.client import ConnectorClient
+from fetch_api.src.registry import ConnectorRegistry
 from fetch_api.src.api_processor import APIProcessor
+from fetch_api.src.summaries import SummaryTickets
 from fetch_api.src.schemas.ml import MLBody
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 
 router = APIRouter()
-client = ConnectorClient(
-    connectors['ml'].name,
-    cache=connectors['ml'].cache,
-    requests_timeout=connectors['ml'].requests_timeout
-)
 
 
 @router.post('/ask', tags=['connector-ml'], summary='Ask the AI')
 def ask_ai(
     request: Request,
     body: MLBody
-) -> JSONResponse:
+) -> Response:
+    if body.stream:
+        return APIProcessor.process_stream(
+            request=request,
+            body=body,
+            client=ConnectorRegistry.get('ml'),
+            upstream={
+                'endpoint': 'ask'
+            }
+        )
+
     return APIProcessor.process_request(
         request=request,
         body=body,
-        client=client,
+        client=ConnectorRegistry.get('ml'),
         upstreams=[{
             'method': 'POST',
             'endpoint':'ask'
         }]
     )
+
+
+@router.get('/summaries/{ticket_id}', tags=['connector-ml'], summary='Fetch an AI summary scheduled with ai_async')
+def fetch_summary(
+    ticket_id: str
+) -> JSONResponse:
+    ticket = SummaryTickets.get(ticket_id)
+
+    return JSONResponse(
+        status_code=404 if ticket is None else 200,
+        content=SummaryTickets.view(ticket_id, ticket)
+    )
+
+
+@router.get('/summaries/{ticket_id}/stream', tags=['connector-ml'], summary='Stream the status of an AI summary scheduled with ai_async')
+def stream_summary(
+    ticket_id: str
+) -> StreamingResponse:
+    return StreamingResponse(
+        SummaryTickets.stream(ticket_id),
+        media_type='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
@@ -4,3 +4,4 @@ from pydantic import BaseModel
 
 class GrafanaBody(BaseModel):
     ai: bool = False
+    ai_async: bool = False
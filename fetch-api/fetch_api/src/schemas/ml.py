@@ -7,3 +7,4 @@ class MLBody(BaseModel):
     model: str | None = None
     instructions: str | None = None
     instructions_template: str | None = None
+    stream: bool = False
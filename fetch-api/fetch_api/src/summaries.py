@@ -0,0 +1,224 @@
+import json, time, uuid, asyncio, threading
+from typing import Any, AsyncIterator
+from fetch_api.settings import settings
+from fetch_api.src.client import ConnectorClient
+from fetch_api.src.registry import ConnectorRegistry
+from fetch_api.src.executors import summary_executor
+from fetch_api.src.telemetry.logging import log
+from common.telemetry.src.tracing.wrappers import traced
+from common.utils.helpers import TimeUtils
+from common.utils.concurrency import submit_with_context
+
+
+
+class SummaryTickets:
+    running = 0
+    lock = threading.Lock()
+
+
+    @staticmethod
+    def get_key(ticket_id: str) -> str:
+        return f'ticket:{ticket_id}'
+
+
+    @staticmethod
+    def get_pending_key(cache_key: str) -> str:
+        return f'ticket:pending:{cache_key}'
+
+
+    @staticmethod
+    def get(ticket_id: str) -> dict | None:
+        return ConnectorRegistry.get_redis().get(
+            SummaryTickets.get_key(ticket_id),
+            l1=False
+        )
+
+
+    @staticmethod
+    def save(ticket_id: str, ticket: dict) -> None:
+        ConnectorRegistry.get_redis().set(
+            SummaryTickets.get_key(ticket_id),
+            ticket,
+            ttl=settings.ai_summary_ticket_ttl_seconds,
+            l1=False
+        )
+
+
+    @staticmethod
+    def view(ticket_id: str, ticket: dict | None) -> dict:
+        result = {
+            'ticket': ticket_id,
+            'status': 'unknown' if ticket is None else ticket['status'],
+            'poll_url': f'/ml/summaries/{ticket_id}',
+            'stream_url': f'/ml/summaries/{ticket_id}/stream'
+        }
+
+        if ticket is None:
+            return result
+
+        result['created_at'] = ticket['created_at']
+
+        if ticket['status'] == 'ready':
+            result['ai_summary'] = ticket['ai_summary']
+
+        if ticket['status'] == 'failed':
+            result['error'] = ticket['error']
+
+        return result
+
+
+    @staticmethod
+    @traced('create summary ticket')
+    def create(ml_client: ConnectorClient, data: dict, cache_key: str, span=None) -> dict:
+        created_at = TimeUtils.time_now()
+        cached_value = ml_client.redis.get(cache_key)
+
+        span.set_attributes({
+            'summary.cache.key': cache_key,
+            'summary.cache.status': 'miss' if cached_value is None else 'hit'
+        })
+
+        if not cached_value is None and cached_value['status_code'] == 200:
+            ticket_id = uuid.uuid4().hex
+            ticket = {
+                'status': 'ready',
+                'cache_key': cache_key,
+                'created_at': created_at,
+                'ai_summary': {
+                    **cached_value['json']['items'][0],
+                    'cached': True,
+                    'cached_at': cached_value['cached_at']
+                }
+            }
+            SummaryTickets.save(ticket_id, ticket)
+            span.set_attributes({'summary.ticket': ticket_id})
+
+            return SummaryTickets.view(ticket_id, ticket)
+
+        redis = ConnectorRegistry.get_redis()
+        pending_key = SummaryTickets.get_pending_key(cache_key)
+        ticket_id = redis.get(pending_key, l1=False)
+        shared = not ticket_id is None
+
+        if not shared:
+            with SummaryTickets.lock:
+                if SummaryTickets.running >= settings.ai_summary_max_pending:
+                    span.set_attributes({
+                        'summary.ticket.rejected': True,
+                        'summary.pending': SummaryTickets.running
+                    })
+                    raise RuntimeError(f'{SummaryTickets.running} AI summaries are already pending')
+
+                SummaryTickets.running += 1
+
+            ticket_id = uuid.uuid4().hex
+            ticket = {
+                'status': 'pending',
+                'cache_key': cache_key,
+                'created_at': created_at
+            }
+
+            if redis.add(pending_key, ticket_id, ttl=settings.ai_summary_async_requests_timeout):
+                SummaryTickets.save(ticket_id, ticket)
+
+            else:
+                with SummaryTickets.lock:
+                    SummaryTickets.running -= 1
+
+                ticket_id = redis.get(pending_key, l1=False)
+                shared = True
+
+        span.set_attributes({
+            'summary.ticket': ticket_id,
+            'summary.ticket.shared': shared
+        })
+
+        if not shared:
+            submit_with_context(
+                summary_executor,
+                SummaryTickets.generate,
+                ml_client=ml_client,
+                ticket_id=ticket_id,
+                ticket=ticket,
+                data=data
+            )
+
+        return SummaryTickets.view(ticket_id, {
+            'status': 'pending',
+            'created_at': created_at
+        })
+
+
+    @staticmethod
+    @traced('generate summary')
+    def generate(ml_client: ConnectorClient, ticket_id: str, ticket: dict, data: dict, span=None) -> None:
+        span.set_attributes({
+            'summary.ticket': ticket_id,
+            'summary.cache.key': ticket['cache_key']
+        })
+
+        try:
+            response = ml_client.post(
+                endpoint='ask',
+                data=data,
+                cache_key=ticket['cache_key']
+            )
+
+            assert response.status_code == 200
+
+            response_body = response.json()
+            ticket['ai_summary'] = {**response_body['items'][0]}
+
+            if response_body.get('cached') and response_body['cached'] is True:
+                ticket['ai_summary']['cached'] = True
+                ticket['ai_summary']['cached_at'] = response_body['cached_at']
+
+            ticket['status'] = 'ready'
+
+        except Exception as err:
+            log.warning('Background AI summary failed', extra={
+                'ticket': ticket_id,
+                'error': str(err)
+            })
+            ticket['status'] = 'failed'
+            ticket['error'] = str(err) or type(err).__name__
+
+        finally:
+            span.set_attributes({'summary.ticket.status': ticket['status']})
+            SummaryTickets.save(ticket_id, ticket)
+
+            ConnectorRegistry.get_redis().delete(SummaryTickets.get_pending_key(ticket['cache_key']))
+
+            with SummaryTickets.lock:
+                SummaryTickets.running -= 1
+
+
+    @staticmethod
+    def format_event(event: str, data: Any) -> str:
+        return f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+    @staticmethod
+    async def stream(ticket_id: str) -> AsyncIterator[str]:
+        deadline = time.monotonic() + settings.ai_summary_stream_timeout_seconds
+        last_status = None
+
+        while True:
+            ticket = await asyncio.to_thread(SummaryTickets.get, ticket_id)
+            result = SummaryTickets.view(ticket_id, ticket)
+
+            if result['status'] != last_status:
+                last_status = result['status']
+                yield SummaryTickets.format_event(last_status, result)
+
+            else:
+                yield ': keep-alive\n\n'
+
+            if last_status in ('ready', 'failed', 'unknown'):
+                return
+
+            if time.monotonic() >= deadline:
+                yield SummaryTickets.format_event('timeout', result)
+                return
+
+            await asyncio.sleep(settings.ai_summary_stream_poll_seconds)
@@ -0,0 +1,56 @@
+import os, sys, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.server.requests.append(self.path)
+
+        status_code, headers, content = self.server.responses.get(self.path, (404, {}, b'{}'))
+
+        self.send_response(status_code)
+
+        for header, value in headers.items():
+            self.send_header(header, value)
+
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+stub_server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+stub_server.requests = []
+stub_server.responses = {}
+
+threading.Thread(target=stub_server.serve_forever, daemon=True).start()
+
+os.environ.update({
+    'CONNECTORS': 'grafana,ml',
+    'CONNECTOR_GRAFANA_HOST': '127.0.0.1',
+    'CONNECTOR_GRAFANA_PORT': str(stub_server.server_address[1]),
+    'CONNECTOR_ML_HOST': '127.0.0.1',
+    'CONNECTOR_ML_PORT': str(stub_server.server_address[1]),
+    'LOG_LEVEL': 'critical',
+    'OTLP_ENDPOINT_GRPC': 'localhost:4317'
+})
+
+
+@pytest.fixture
+def stub():
+    stub_server.requests.clear()
+    stub_server.responses = {}
+
+    yield stub_server
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from fetch_api.src.cache import client as cache_module
+from fetch_api.src.cache.client import RedisClient
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+
+@pytest.fixture
+def redis_client(monkeypatch) -> RedisClient:
+    server = fakeredis.FakeServer()
+
+    monkeypatch.setattr(
+        cache_module.redis,
+        'Redis',
+        lambda host, port, db, password: fakeredis.FakeRedis(server=server, db=db)
+    )
+
+    return RedisClient('127.0.0.1', 6379, 0, l1_max_items=16, l1_ttl=30)
+
+
+def l1_expires_in(redis_client: RedisClient, key: str) -> float:
+    expires_at, _ = redis_client.l1.entries[key]
+
+    return expires_at - time.monotonic()
+
+
+
+def test_l1_entry_expires_with_redis_key(redis_client) -> None:
+    redis_client.client.set('grafana:car', redis_client.codec.encode({'items': []}), px=2000)
+
+    assert redis_client.get('grafana:car') == {'items': []}
+    assert 0 < l1_expires_in(redis_client, 'grafana:car') <= 2
+
+
+def test_l1_entry_uses_full_ttl_for_persistent_redis_key(redis_client) -> None:
+    redis_client.client.set('grafana:car', redis_client.codec.encode({'items': []}))
+
+    redis_client.get('grafana:car')
+
+    assert 2 < l1_expires_in(redis_client, 'grafana:car') <= 30
+
+
+def test_l1_returns_independent_copies(redis_client) -> None:
+    redis_client.set('grafana:car', {'items': [{'state': 'online'}]}, ttl=60)
+
+    first = redis_client.get('grafana:car')
+    first['items'].append({'state': 'asleep'})
+    first['ai_summary'] = {'ticket': 'abc'}
+
+    assert redis_client.get('grafana:car') == {'items': [{'state': 'online'}]}
+
+    redis_client.l1.entries.clear()
+    second = redis_client.get('grafana:car')
+    second['items'].clear()
+
+    assert redis_client.get('grafana:car') == {'items': [{'state': 'online'}]}
@@ -0,0 +1,89 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from requests import exceptions as ReqExceptions
+from fetch_api.src.client import ConnectorClient, ConnectorSession
+
+
+CACHED_VALUE = {
+    'cached_at': '2026-10-18T12:00:00',
+    'cached_ts': 0,
+    'status_code': 200,
+    'json': {'total_items': 1, 'items': [{'state': 'online'}]}
+}
+
+
+
+class Redis:
+    def __init__(self, values: dict) -> None:
+        self.values = values
+
+    def get(self, key: str) -> dict | None:
+        return self.values.get(key)
+
+
+
+class Sessions(dict):
+    def items(self):
+        for item in super().items():
+            ConnectorSession.get('ml')
+            yield item
+
+
+def join_slow_request(client: ConnectorClient, monkeypatch) -> tuple[list, threading.Event, threading.Thread]:
+    started = threading.Event()
+    release = threading.Event()
+    owner_responses = []
+
+    def send(method: str, endpoint: str, params: dict, data: dict) -> SimpleNamespace:
+        started.set()
+        release.wait(10)
+
+        return SimpleNamespace(status_code=503)
+
+    monkeypatch.setattr(client, 'send', send)
+
+    owner = threading.Thread(target=lambda: owner_responses.append(client.get('car-state', cache_key='car-state')))
+    owner.start()
+    started.wait(5)
+
+    return owner_responses, release, owner
+
+
+def test_joiner_timeout_serves_cached_response(monkeypatch) -> None:
+    client = ConnectorClient('grafana', requests_timeout=1, cache=True, redis=Redis({'car-state': CACHED_VALUE}))
+    owner_responses, release, owner = join_slow_request(client, monkeypatch)
+
+    try:
+        response = client.get('car-state', cache_key='car-state')
+
+    finally:
+        release.set()
+        owner.join(5)
+
+    assert response.json()['cached'] is True
+    assert response.json()['items'] == [{'state': 'online'}]
+    assert owner_responses[0].json()['cached'] is True
+
+
+def test_joiner_timeout_without_cache_raises_request_timeout(monkeypatch) -> None:
+    client = ConnectorClient('grafana', requests_timeout=1)
+    _, release, owner = join_slow_request(client, monkeypatch)
+
+    try:
+        with pytest.raises(ReqExceptions.Timeout):
+            client.get('car-state', cache_key='car-state')
+
+    finally:
+        release.set()
+        owner.join(5)
+
+
+def test_session_stats_tolerate_concurrent_inserts(monkeypatch) -> None:
+    monkeypatch.setattr(ConnectorSession, 'sessions', Sessions(grafana=ConnectorSession.create('grafana')))
+
+    stats = ConnectorSession.get_stats()
+
+    assert list(stats) == ['grafana']
+    assert stats['grafana']['requests_sent'] == 0
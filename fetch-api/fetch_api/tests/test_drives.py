@@ -0,0 +1,96 @@
+import pytest
+from fetch_api.src.drives import DriveHistory
+from fetch_api.src.api_processor import APIProcessor
+
+
+UPSTREAM = {
+    'connector': 'grafana',
+    'endpoint': 'teslamate/drives',
+    'params': {'number_of_drives': 3, 'car_id': 1}
+}
+
+
+
+class Teslamate:
+    def __init__(self, drives: list[dict]) -> None:
+        self.drives = {drive['id']: drive for drive in drives}
+        self.requests = []
+        self.history = {}
+        self.saves = 0
+
+    def fetch_upstream(self, client, body, upstream) -> tuple[list, None, bool, list]:
+        params = upstream['params']
+        self.requests.append(params)
+
+        items = sorted(
+            [
+                drive for drive in self.drives.values()
+                if drive['id'] > params.get('after_drive_id', 0)
+            ],
+            key=lambda drive: drive['id'],
+            reverse=True
+        )[:params['number_of_drives']]
+
+        return items, None, False, []
+
+    def load(self, car_id: int) -> dict | None:
+        return self.history.get(car_id)
+
+    def save(self, car_id: int, history: dict) -> None:
+        self.history[car_id] = history
+        self.saves += 1
+
+
+def drive(drive_id: int, end_time: str | None = None) -> dict:
+    return {'id': drive_id, 'end_time': end_time or f'2026-10-{drive_id:02d}T12:00:00'}
+
+
+@pytest.fixture
+def teslamate(monkeypatch) -> Teslamate:
+    teslamate = Teslamate([drive(1), drive(2), drive(3), drive(4), drive(5, 'N/A')])
+
+    monkeypatch.setattr(APIProcessor, 'fetch_upstream', teslamate.fetch_upstream)
+    monkeypatch.setattr(DriveHistory, 'load', teslamate.load)
+    monkeypatch.setattr(DriveHistory, 'save', teslamate.save)
+
+    return teslamate
+
+
+def fetch_ids() -> list[int]:
+    items, _, partial, _ = DriveHistory.fetch(None, {}, UPSTREAM)
+
+    assert partial is False
+
+    return [item['id'] for item in items]
+
+
+
+def test_incremental_fetch_skips_unchanged_history(teslamate) -> None:
+    assert fetch_ids() == [5, 4, 3]
+    assert fetch_ids() == [5, 4, 3]
+
+    assert teslamate.requests[-1]['after_drive_id'] == 4
+    assert teslamate.saves == 1
+
+
+def test_incremental_fetch_refreshes_finished_drive(teslamate) -> None:
+    fetch_ids()
+    teslamate.drives[5] = drive(5)
+    teslamate.drives[6] = drive(6, 'N/A')
+
+    assert fetch_ids() == [6, 5, 4]
+    assert teslamate.history[1]['drives'][1] == drive(5)
+    assert teslamate.requests[-1]['after_drive_id'] == 4
+
+
+def test_incremental_fetch_drops_discarded_incomplete_drive(teslamate) -> None:
+    fetch_ids()
+    del teslamate.drives[5]
+
+    assert fetch_ids() == [4, 3, 2]
+    assert [drive['id'] for drive in teslamate.history[1]['drives']] == [4, 3, 2]
+    assert teslamate.saves == 2
+
+    assert fetch_ids() == [4, 3, 2]
+    assert teslamate.requests[-1]['after_drive_id'] == 4
+    assert teslamate.saves == 2
@@ -0,0 +1,67 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fetch_api.src import client as client_module
+from fetch_api.src.client import ConnectorClient
+from fetch_api.src.api_processor import APIProcessor
+from fetch_api.src.schemas.ml import MLBody
+
+
+
+class Redis:
+    def get(self, key: str) -> None:
+        return None
+
+
+@pytest.fixture
+def ml_client(monkeypatch) -> ConnectorClient:
+    client = ConnectorClient('ml', cache=True, redis=Redis())
+    client.written = []
+
+    monkeypatch.setattr(client, 'write_cache', lambda cache_key, response: client.written.append((cache_key, response.json())))
+    monkeypatch.setattr(client_module, 'submit_with_context', lambda executor, func, **kwargs: func(**kwargs))
+
+    return client
+
+
+def process_stream(client: ConnectorClient):
+    return APIProcessor.process_stream(
+        request=SimpleNamespace(scope={'path': '/ml/ask'}),
+        body=MLBody(prompt='How is the car?', stream=True),
+        client=client,
+        upstream={'endpoint': 'ask'}
+    )
+
+
+
+def test_stream_caches_done_event_in_any_key_order(stub, ml_client) -> None:
+    stub.responses['/ask'] = (200, {'Content-Type': 'application/x-ndjson'}, b'\n'.join([
+        b'{"event": "chunk", "content": "The car"}',
+        b'not json',
+        b'{"answer": "The car is asleep", "event": "done"}'
+    ]) + b'\n')
+
+    chunks = list(ml_client.stream('ask', {'prompt': 'How is the car?'}, cache_key='ask'))
+
+    assert len(chunks) == 3
+    assert ml_client.written == [('ask', {'answer': 'The car is asleep'})]
+
+
+def test_stream_passes_busy_connector_through(stub, ml_client) -> None:
+    stub.responses['/ask'] = (503, {'Content-Type': 'application/json', 'Retry-After': '5'}, b'{}')
+
+    response = process_stream(ml_client)
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '5'
+    assert json.loads(response.body) == {'error': 'The server is busy, please try again later.'}
+
+
+def test_stream_reports_other_connector_errors_as_bad_gateway(stub, ml_client) -> None:
+    stub.responses['/ask'] = (500, {'Content-Type': 'application/json'}, b'{}')
+
+    response = process_stream(ml_client)
+
+    assert response.status_code == 502
+    assert not 'Retry-After' in response.headers
@@ -0,0 +1,108 @@
+import pytest
+from fetch_api.settings import settings
+from fetch_api.src import summaries as summaries_module
+from fetch_api.src.cache import client as cache_module
+from fetch_api.src.cache.client import RedisClient
+from fetch_api.src.registry import ConnectorRegistry
+from fetch_api.src.summaries import SummaryTickets
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+
+class Executor:
+    def __init__(self) -> None:
+        self.calls = []
+
+
+    def submit(self, func, *args, **kwargs) -> None:
+        self.calls.append((func, args, kwargs))
+
+
+    def run(self) -> None:
+        while self.calls:
+            func, args, kwargs = self.calls.pop(0)
+            func(*args, **kwargs)
+
+
+
+class Response:
+    status_code = 200
+
+
+    def json(self) -> dict:
+        return {'items': [{'summary': 'Quiet week'}]}
+
+
+
+class MLClient:
+    def __init__(self, redis: RedisClient) -> None:
+        self.redis = redis
+
+
+    def post(self, endpoint: str, data: dict, cache_key: str) -> Response:
+        return Response()
+
+
+
+@pytest.fixture
+def processes(monkeypatch) -> list[RedisClient]:
+    server = fakeredis.FakeServer()
+
+    monkeypatch.setattr(
+        cache_module.redis,
+        'Redis',
+        lambda host, port, db, password: fakeredis.FakeRedis(server=server, db=db)
+    )
+    monkeypatch.setattr(SummaryTickets, 'running', 0)
+
+    return [RedisClient('127.0.0.1', 6379, 0) for _ in range(2)]
+
+
+@pytest.fixture
+def executor(monkeypatch) -> Executor:
+    executor = Executor()
+    monkeypatch.setattr(summaries_module, 'summary_executor', executor)
+
+    return executor
+
+
+def create(monkeypatch, redis: RedisClient, cache_key: str = 'ml:ask:week') -> dict:
+    monkeypatch.setattr(ConnectorRegistry, 'redis', redis)
+
+    return SummaryTickets.create(MLClient(redis), {'question': 'week'}, cache_key)
+
+
+
+def test_pending_ticket_is_shared_across_processes(monkeypatch, processes, executor) -> None:
+    first = create(monkeypatch, processes[0])
+
+    monkeypatch.setattr(SummaryTickets, 'running', 0)
+    second = create(monkeypatch, processes[1])
+
+    assert second['ticket'] == first['ticket']
+    assert second['status'] == 'pending'
+    assert SummaryTickets.get(first['ticket'])['status'] == 'pending'
+    assert len(executor.calls) == 1
+
+
+def test_generate_releases_pending_ticket(monkeypatch, processes, executor) -> None:
+    first = create(monkeypatch, processes[0])
+    executor.run()
+
+    ticket = SummaryTickets.get(first['ticket'])
+
+    assert ticket['status'] == 'ready'
+    assert ticket['ai_summary'] == {'summary': 'Quiet week'}
+    assert SummaryTickets.running == 0
+    assert create(monkeypatch, processes[1])['ticket'] != first['ticket']
+
+
+def test_create_rejects_when_too_many_summaries_are_running(monkeypatch, processes, executor) -> None:
+    monkeypatch.setattr(settings, 'ai_summary_max_pending', 1)
+    create(monkeypatch, processes[0], 'ml:ask:week')
+
+    with pytest.raises(RuntimeError):
+        create(monkeypatch, processes[0], 'ml:ask:month')
+
+    assert processes[0].get(SummaryTickets.get_pending_key('ml:ask:month'), l1=False) is None
@@ -0,0 +1,96 @@
+import os, sys, json, time, argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from fetch_api.src.cache.codec import CacheCodec
+
+
+
+def load_files(paths: list) -> list:
+    payloads = []
+
+    for path in paths:
+        with open(path, 'r') as file:
+            payloads.append(json.load(file))
+
+    return payloads
+
+
+def load_redis(host: str, port: int, db: int, password: str | None, pattern: str) -> list:
+    import redis
+
+    client = redis.Redis(host=host, port=port, db=db, password=password)
+    codec = CacheCodec()
+    payloads = []
+
+    for key in client.scan_iter(match=pattern):
+        value = client.get(key)
+
+        if not value is None:
+            payloads.append(codec.decode(value))
+
+    return payloads
+
+
+def measure(codec: CacheCodec, payloads: list, rounds: int) -> dict:
+    encoded = [codec.encode(payload) for payload in payloads]
+
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            codec.encode(payload)
+    encode_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        for raw in encoded:
+            codec.decode(raw)
+    decode_seconds = time.perf_counter() - started_at
+
+    operations = rounds * len(payloads)
+
+    return {
+        'size_bytes': sum(len(raw) for raw in encoded),
+        'encode_us': encode_seconds / operations * 1_000_000,
+        'decode_us': decode_seconds / operations * 1_000_000
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare cache codecs on recorded connector payloads')
+    parser.add_argument('files', nargs='*', help='JSON files with recorded payloads')
+    parser.add_argument('--redis-host', default=os.getenv('REDIS_HOST', 'localhost'))
+    parser.add_argument('--redis-port', type=int, default=int(os.getenv('REDIS_PORT', 6379)))
+    parser.add_argument('--redis-db', type=int, default=int(os.getenv('REDIS_DB', 1)))
+    parser.add_argument('--redis-password', default=os.getenv('REDIS_PASSWORD'))
+    parser.add_argument('--redis-pattern', default='connector:*')
+    parser.add_argument('--threshold', type=int, default=4096)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    if args.files:
+        payloads = load_files(args.files)
+    else:
+        payloads = load_redis(args.redis_host, args.redis_port, args.redis_db, args.redis_password, args.redis_pattern)
+
+    if not payloads:
+        print('No payloads found')
+        raise SystemExit(1)
+
+    print(f'{len(payloads)} payloads, {args.rounds} rounds, compression threshold {args.threshold} bytes\n')
+    print(f'{"codec":<18}{"size (bytes)":>14}{"encode (us)":>14}{"decode (us)":>14}')
+
+    for format, compression in CacheCodec.headers:
+        try:
+            codec = CacheCodec(format, compression, args.threshold)
+
+        except ValueError as err:
+            print(f'{format + "+" + compression:<18}  skipped: {str(err)}')
+            continue
+
+        result = measure(codec, payloads, args.rounds)
+        print(f'{format + "+" + compression:<18}{result["size_bytes"]:>14}{result["encode_us"]:>14.1f}{result["decode_us"]:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+import os, sys, copy, json, time, random, argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from common.utils.helpers import TimeUtils, DataUtils
+from common.utils.system import read_file
+from connectors.grafana.src.grafana.transforms import TransformPlan
+
+
+
+QUERIES_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'connectors', 'grafana', 'templates', 'postgresql', 'queries.yaml')
+QUERY_ID = 'teslamate-car-drives-info'
+
+FIELDS = [
+    'start_date_ts', 'end_date_ts', 'car_id', 'start_path', 'end_path', 'duration_str', 'drive_id',
+    'start_date', 'start_address', 'end_address', 'duration_min', 'distance_km', '% Start', '% End',
+    'outside_temp_c', 'speed_avg_km', 'speed_max_km', 'power_max', 'has_reduced_range', 'efficiency',
+    'consumption_kwh', 'consumption_kwh_km'
+]
+DROPPED = ['car_id', 'start_date']
+RENAMED = {
+    'start_date_ts': 'start_time',
+    'end_date_ts': 'end_time',
+    'drive_id': 'id',
+    'duration_str': 'duration',
+    'duration_min': 'duration_minutes',
+    '% Start': 'start_battery_percentage',
+    '% End': 'end_battery_percentage',
+    'outside_temp_c': 'outside_temperature_celsius',
+    'speed_avg_km': 'average_speed_kmh',
+    'speed_max_km': 'max_speed_kmh',
+    'power_max': 'max_power_kw',
+    'has_reduced_range': 'reduced_range',
+    'efficiency': 'average_driving_efficiency_percentage',
+    'consumption_kwh': 'total_consumption_kwh',
+    'consumption_kwh_km': 'average_consumption_wh_per_km',
+    'start_path': 'start_address_url',
+    'end_path': 'end_address_url'
+}
+
+
+def create_frame(rows: int) -> dict:
+    random.seed(rows)
+    now_ms = 1_760_000_000_000
+    values = [[] for _ in FIELDS]
+
+    for index in range(rows):
+        start_ms = now_ms - index * 7_200_000
+        duration_min = random.randint(1, 90)
+        in_progress = index == 0
+        precise = random.random() > 0.2
+
+        row = [
+            float(start_ms),
+            None if in_progress else float(start_ms + duration_min * 60_000),
+            1,
+            f'new?lat=42.{random.randint(100000, 999999)}&lng=23.{random.randint(100000, 999999)}',
+            '1/edit' if random.random() > 0.5 else f'new?lat=42.{random.randint(100000, 999999)}&lng=23.{random.randint(100000, 999999)}',
+            f'{duration_min // 60:02d}:{duration_min % 60:02d}',
+            rows - index,
+            start_ms,
+            'Vitosha Boulevard 1, Sofia',
+            'Home',
+            float(duration_min),
+            random.uniform(1, 120),
+            random.randint(40, 90),
+            None if in_progress else random.randint(10, 40),
+            random.uniform(-5, 35),
+            random.uniform(20, 110),
+            float(random.randint(60, 180)),
+            random.randint(50, 250),
+            False,
+            random.uniform(0.7, 1.1) if precise else None,
+            random.uniform(0.5, 25) if precise else None,
+            random.uniform(120, 220) if precise else None
+        ]
+
+        for column, value in zip(values, row):
+            column.append(value)
+
+    return {
+        'schema': {'fields': [{'name': field} for field in FIELDS]},
+        'data': {'values': values}
+    }
+
+
+def process_rows(frame: dict) -> list[dict]:
+    field_names = [field['name'] for field in frame['schema']['fields']]
+    data = [dict(zip(field_names, row)) for row in zip(*frame['data']['values'])]
+
+    for item in data:
+        for key in DROPPED:
+            item.pop(key, None)
+
+    data = [{RENAMED.get(key, key): value for key, value in item.items()} for item in data]
+
+    for item in data:
+        try:
+            item['grafana_drive_url'] = DataUtils.get_teslamate_drive_grafana_url(
+                drive_id = item['id'],
+                drive_start_time = TimeUtils.time_beautify_ms(item['start_time'], convert_tz=False),
+                drive_end_time = TimeUtils.time_beautify_ms(item['end_time'], convert_tz=False)
+            )
+        except:
+            item['grafana_drive_url'] = 'N/A'
+
+        for key in ['start_time', 'end_time']:
+            if item[key] is None:
+                item[key] = 'N/A'
+            else:
+                item[key] = TimeUtils.time_beautify_ms(item[key])
+                item[f'{key}_ordinal'] = TimeUtils.time_beautify_ordinal(item[key])
+
+        for key in ['start_address_url', 'end_address_url']:
+            if item[key] is None:
+                item[key] = 'N/A'
+            else:
+                item[key] = DataUtils.get_maps_url(item[key])
+
+        try:
+            item['directions_url'] = DataUtils.get_maps_directions_url(item['start_address_url'], item['end_address_url'])
+        except:
+            pass
+
+        for key in ['total_consumption_kwh', 'average_consumption_wh_per_km']:
+            item[key] = 'N/A' if item[key] is None else round(item[key], 2)
+
+        item['distance_km'] = 'N/A' if item['distance_km'] is None else round(item['distance_km'], 1)
+        item['average_speed_kmh'] = 'N/A' if item['average_speed_kmh'] is None else round(item['average_speed_kmh'], 0)
+
+        if item['average_driving_efficiency_percentage'] is None:
+            item['average_driving_efficiency_percentage'] = 'N/A'
+        else:
+            item['average_driving_efficiency_percentage'] = round((item['average_driving_efficiency_percentage'] * 100), 1)
+
+        try:
+            item['battery_used_percentage'] = (item['start_battery_percentage'] - item['end_battery_percentage'])
+        except:
+            pass
+
+        try:
+            item['duration_end_since_start'] = TimeUtils.time_since(item['start_time'], item['end_time'], instant=False)
+        except:
+            pass
+
+    return data
+
+
+def load_plan(memoize: bool = True) -> TransformPlan:
+    for query in read_file(QUERIES_FILE):
+        if query['query']['id'] == QUERY_ID:
+            spec = dict(query['query'].get('transform'))
+
+            if not memoize:
+                spec.pop('memoize', None)
+
+            return TransformPlan(QUERY_ID, spec)
+
+    raise SystemExit(f'{QUERY_ID} not found in {QUERIES_FILE}')
+
+
+def process_plan(plan: TransformPlan, frame: dict) -> list[dict]:
+    return plan.apply({'frames': [frame]})
+
+
+def measure(func, frame: dict, rounds: int) -> float:
+    started_at = time.perf_counter()
+
+    for _ in range(rounds):
+        func(frame)
+
+    return (time.perf_counter() - started_at) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare row-based drive history processing with the compiled and memoized transform plans')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 4000])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    plan = load_plan(memoize=False)
+    process_columns = lambda frame: process_plan(plan, frame)
+
+    print(f'{"rows":>8}{"rows (ms)":>14}{"columns (ms)":>14}{"memoized (ms)":>15}{"speedup":>10}')
+
+    for rows in args.rows:
+        memoized_plan = load_plan(memoize=True)
+        process_memoized = lambda frame: process_plan(memoized_plan, frame)
+
+        frame = create_frame(rows)
+        snapshot = copy.deepcopy(frame)
+        expected = json.dumps(process_rows(frame))
+
+        assert expected == json.dumps(process_columns(frame))
+        assert expected == json.dumps(process_memoized(frame))
+
+        for item in process_memoized(frame):
+            item.clear()
+
+        assert expected == json.dumps(process_memoized(frame))
+        assert frame == snapshot
+
+        rows_ms = measure(process_rows, frame, args.rounds)
+        columns_ms = measure(process_columns, frame, args.rounds)
+        memoized_ms = measure(process_memoized, frame, args.rounds)
+
+        print(f'{rows:>8}{rows_ms:>14.1f}{columns_ms:>14.1f}{memoized_ms:>15.1f}{rows_ms / memoized_ms:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import os, sys, copy, json, time, argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from common.utils.system import read_file
+from connectors.grafana.src.grafana.payload import PayloadBuilder
+
+
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'connectors', 'grafana', 'templates')
+EXPRESSION_KEYS = {
+    'postgresql': 'rawSql',
+    'prometheus': 'expr'
+}
+
+
+def load_queries() -> list:
+    queries = []
+
+    for ds_type, expression_key in EXPRESSION_KEYS.items():
+        payload = read_file(os.path.join(TEMPLATES_DIR, ds_type, 'payload.json'))
+        payload['queries'][0]['datasource']['uid'] = f'{ds_type}-uid'
+
+        for query in read_file(os.path.join(TEMPLATES_DIR, ds_type, 'queries.yaml')):
+            queries.append((
+                query['query']['id'],
+                payload,
+                expression_key,
+                PayloadBuilder(payload, expression_key),
+                query['query']['query']
+            ))
+
+    return queries
+
+
+def render_deepcopy(payload: dict, expression_key: str, expression: str) -> bytes:
+    rendered = copy.deepcopy(payload)
+    rendered['queries'][0][expression_key] = expression
+
+    return json.dumps(rendered).encode()
+
+
+def render_builder(payload_builder: PayloadBuilder, expression: str) -> bytes:
+    return payload_builder.build([
+        payload_builder.query(expression)
+    ])
+
+
+def measure(func, args: tuple, rounds: int) -> float:
+    started_at = time.perf_counter()
+
+    for _ in range(rounds):
+        func(*args)
+
+    return (time.perf_counter() - started_at) / rounds * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare deepcopy and precomputed Grafana payload rendering')
+    parser.add_argument('--rounds', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f'{"query id":<40}{"deepcopy (us)":>16}{"builder (us)":>16}{"speedup":>10}')
+
+    for query_id, payload, expression_key, payload_builder, expression in load_queries():
+        assert json.loads(render_deepcopy(payload, expression_key, expression)) == json.loads(render_builder(payload_builder, expression))
+
+        deepcopy_us = measure(render_deepcopy, (payload, expression_key, expression), args.rounds)
+        builder_us = measure(render_builder, (payload_builder, expression), args.rounds)
+
+        print(f'{query_id:<40}{deepcopy_us:>16.2f}{builder_us:>16.2f}{deepcopy_us / builder_us:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import os, sys, time, random, zoneinfo, argparse
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from common.utils.helpers import TimeUtils, Timestamps
+
+
+
+def legacy_beautify_ms(milliseconds: int, target_tz: str = 'Europe/Sofia') -> str:
+    tz = zoneinfo.ZoneInfo(target_tz)
+    dt = datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc).astimezone(tz)
+
+    return dt.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def legacy_beautify_ordinal(dt_string: str, target_tz: str = 'Europe/Sofia') -> str:
+    tz = zoneinfo.ZoneInfo(target_tz)
+    dt = datetime.fromisoformat(dt_string)
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz)
+
+    if 10 <= dt.day % 100 <= 20:
+        suffix = 'th'
+    else:
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(dt.day % 10, 'th')
+
+    return f'{dt.year} / {dt.day}{suffix} of {dt.strftime("%B")} at {dt.strftime("%H:%M")}'
+
+
+def legacy_since(past: str, future: str, tz: str = 'Europe/Sofia', instant: bool = False) -> str:
+    tz = zoneinfo.ZoneInfo(tz)
+    past_dt = datetime.fromisoformat(past)
+    future_dt = datetime.fromisoformat(future)
+
+    if past_dt.tzinfo is None:
+        past_dt = past_dt.replace(tzinfo=tz)
+
+    if future_dt.tzinfo is None:
+        future_dt = future_dt.replace(tzinfo=tz)
+
+    return TimeUtils.time_since_seconds((future_dt - past_dt).total_seconds(), instant)
+
+
+def create_columns(values: int) -> tuple[list, list]:
+    random.seed(values)
+    now_ms = 1_760_000_000_000
+    starts = [now_ms - index * 7_200_000 - random.randint(0, 59) * 1000 for index in range(values)]
+    ends = [start + random.randint(1, 600) * 60_000 for start in starts]
+
+    return starts, ends
+
+
+def format_legacy(starts: list, ends: list) -> list[tuple]:
+    result = []
+
+    for start, end in zip(starts, ends):
+        start_iso = legacy_beautify_ms(start)
+        end_iso = legacy_beautify_ms(end)
+
+        result.append((
+            start_iso,
+            end_iso,
+            legacy_beautify_ordinal(start_iso),
+            legacy_since(start_iso, end_iso)
+        ))
+
+    return result
+
+
+def format_helpers(starts: list, ends: list) -> list[tuple]:
+    result = []
+
+    for start, end in zip(starts, ends):
+        start_iso = TimeUtils.time_beautify_ms(start)
+        end_iso = TimeUtils.time_beautify_ms(end)
+
+        result.append((
+            start_iso,
+            end_iso,
+            TimeUtils.time_beautify_ordinal(start_iso),
+            TimeUtils.time_since(start_iso, end_iso, instant=False)
+        ))
+
+    return result
+
+
+def format_columns(starts: list, ends: list) -> list[tuple]:
+    start_times = Timestamps(starts)
+    end_times = Timestamps(ends)
+
+    return list(zip(
+        start_times.iso_local(),
+        end_times.iso_local(),
+        start_times.ordinal(),
+        start_times.since(end_times, instant=False)
+    ))
+
+
+def measure(func, starts: list, ends: list, rounds: int) -> float:
+    started_at = time.perf_counter()
+
+    for _ in range(rounds):
+        func(starts, ends)
+
+    return (time.perf_counter() - started_at) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare per-value timestamp helpers with columnar formatting')
+    parser.add_argument('--values', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"values":>8}{"legacy (ms)":>14}{"helpers (ms)":>14}{"columns (ms)":>14}{"speedup":>10}')
+
+    for values in args.values:
+        starts, ends = create_columns(values)
+        expected = format_legacy(starts, ends)
+
+        assert expected == format_helpers(starts, ends)
+        assert expected == format_columns(starts, ends)
+
+        legacy_ms = measure(format_legacy, starts, ends, args.rounds)
+        helpers_ms = measure(format_helpers, starts, ends, args.rounds)
+        columns_ms = measure(format_columns, starts, ends, args.rounds)
+
+        print(f'{values:>8}{legacy_ms:>14.1f}{helpers_ms:>14.1f}{columns_ms:>14.1f}{legacy_ms / columns_ms:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+-- Subset of the Teslamate schema used by connectors/grafana/templates/postgresql/queries.yaml,
+-- loaded into the teslamate-db service of docker-compose.yaml
+
+CREATE TABLE cars (
+    id SMALLSERIAL PRIMARY KEY,
+    name TEXT,
+    efficiency DOUBLE PRECISION
+);
+
+CREATE TABLE addresses (
+    id SERIAL PRIMARY KEY,
+    display_name VARCHAR(512),
+    name VARCHAR(255),
+    house_number VARCHAR(255),
+    road VARCHAR(255),
+    neighbourhood VARCHAR(255),
+    city VARCHAR(255)
+);
+
+CREATE TABLE geofences (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL
+);
+
+CREATE TABLE positions (
+    id SERIAL PRIMARY KEY,
+    car_id SMALLINT NOT NULL REFERENCES cars(id),
+    date TIMESTAMP NOT NULL,
+    latitude NUMERIC(8, 6) NOT NULL,
+    longitude NUMERIC(9, 6) NOT NULL,
+    battery_level SMALLINT,
+    usable_battery_level SMALLINT
+);
+
+CREATE TABLE charging_processes (
+    id SERIAL PRIMARY KEY,
+    car_id SMALLINT NOT NULL REFERENCES cars(id),
+    position_id INTEGER REFERENCES positions(id),
+    address_id INTEGER REFERENCES addresses(id),
+    geofence_id INTEGER REFERENCES geofences(id),
+    start_date TIMESTAMP NOT NULL,
+    end_date TIMESTAMP,
+    charge_energy_added NUMERIC(8, 2),
+    start_battery_level SMALLINT,
+    end_battery_level SMALLINT,
+    start_rated_range_km NUMERIC(6, 2),
+    end_rated_range_km NUMERIC(6, 2),
+    duration_min SMALLINT
+);
+
+CREATE TABLE charges (
+    id SERIAL PRIMARY KEY,
+    charging_process_id INTEGER NOT NULL REFERENCES charging_processes(id),
+    date TIMESTAMP NOT NULL,
+    charger_phases SMALLINT,
+    usable_battery_level SMALLINT,
+    rated_battery_range_km NUMERIC(6, 2)
+);
+
+CREATE TABLE drives (
+    id SERIAL PRIMARY KEY,
+    car_id SMALLINT NOT NULL REFERENCES cars(id),
+    start_date TIMESTAMP NOT NULL,
+    end_date TIMESTAMP,
+    start_position_id INTEGER REFERENCES positions(id),
+    end_position_id INTEGER REFERENCES positions(id),
+    start_address_id INTEGER REFERENCES addresses(id),
+    end_address_id INTEGER REFERENCES addresses(id),
+    start_geofence_id INTEGER REFERENCES geofences(id),
+    end_geofence_id INTEGER REFERENCES geofences(id),
+    distance DOUBLE PRECISION,
+    duration_min SMALLINT,
+    start_rated_range_km NUMERIC(6, 2),
+    end_rated_range_km NUMERIC(6, 2),
+    outside_temp_avg NUMERIC(4, 1),
+    speed_max SMALLINT,
+    power_max SMALLINT
+);
+
+CREATE TABLE states (
+    id SERIAL PRIMARY KEY,
+    car_id SMALLINT NOT NULL REFERENCES cars(id),
+    state TEXT NOT NULL,
+    start_date TIMESTAMP NOT NULL,
+    end_date TIMESTAMP
+);
+
+CREATE TABLE updates (
+    id SERIAL PRIMARY KEY,
+    car_id SMALLINT NOT NULL REFERENCES cars(id),
+    start_date TIMESTAMP NOT NULL,
+    end_date TIMESTAMP,
+    version VARCHAR(255)
+);
+
+CREATE FUNCTION convert_km(n NUMERIC, unit TEXT) RETURNS NUMERIC AS $$
+    SELECT CASE WHEN unit = 'km' THEN n WHEN unit = 'mi' THEN n / 1.609344 END;
+$$ LANGUAGE SQL IMMUTABLE;
+
+CREATE FUNCTION convert_celsius(n NUMERIC, unit TEXT) RETURNS NUMERIC AS $$
+    SELECT CASE WHEN unit = 'C' THEN n WHEN unit = 'F' THEN (n * 9 / 5) + 32 END;
+$$ LANGUAGE SQL IMMUTABLE;
+
+
+INSERT INTO cars (id, name, efficiency) VALUES (1, 'Model 3', 0.153);
+
+INSERT INTO addresses (id, display_name, name, house_number, road, neighbourhood, city) VALUES
+    (1, 'Vitosha Boulevard 1, Sofia, Bulgaria', NULL, '1', 'Vitosha Boulevard', 'Center', 'Sofia'),
+    (2, 'Business Park Sofia, Mladost, Sofia, Bulgaria', 'Business Park Sofia', NULL, 'Mladost 4', 'Mladost', 'Sofia');
+
+INSERT INTO geofences (id, name) VALUES (1, 'Home');
+
+INSERT INTO positions (id, car_id, date, latitude, longitude, battery_level, usable_battery_level) VALUES
+    (1, 1, NOW() - INTERVAL '2 days', 42.690000, 23.320000, 58, 58),
+    (2, 1, NOW() - INTERVAL '2 days' + INTERVAL '25 minutes', 42.627000, 23.375000, 54, 54),
+    (3, 1, NOW() - INTERVAL '1 day', 42.627000, 23.375000, 88, 88),
+    (4, 1, NOW() - INTERVAL '1 day' + INTERVAL '30 minutes', 42.690000, 23.320000, 84, 84),
+    (5, 1, NOW() - INTERVAL '3 hours', 42.690000, 23.320000, 84, 84),
+    (6, 1, NOW() - INTERVAL '3 hours' + INTERVAL '20 minutes', 42.627000, 23.375000, 81, 80);
+
+INSERT INTO charging_processes (id, car_id, position_id, address_id, geofence_id, start_date, end_date, charge_energy_added, start_battery_level, end_battery_level, start_rated_range_km, end_rated_range_km, duration_min) VALUES
+    (1, 1, 2, 2, NULL, NOW() - INTERVAL '2 days' + INTERVAL '1 hour', NOW() - INTERVAL '2 days' + INTERVAL '3 hours', 21.50, 54, 88, 270.00, 410.00, 120);
+
+INSERT INTO charges (charging_process_id, date, charger_phases, usable_battery_level, rated_battery_range_km) VALUES
+    (1, NOW() - INTERVAL '2 days' + INTERVAL '1 hour', 3, 54, 270.00),
+    (1, NOW() - INTERVAL '2 days' + INTERVAL '2 hours', 3, 72, 340.00),
+    (1, NOW() - INTERVAL '2 days' + INTERVAL '3 hours', 3, 88, 410.00);
+
+INSERT INTO drives (car_id, start_date, end_date, start_position_id, end_position_id, start_address_id, end_address_id, start_geofence_id, end_geofence_id, distance, duration_min, start_rated_range_km, end_rated_range_km, outside_temp_avg, speed_max, power_max) VALUES
+    (1, NOW() - INTERVAL '2 days', NOW() - INTERVAL '2 days' + INTERVAL '25 minutes', 1, 2, 1, 2, 1, NULL, 12.4, 25, 290.00, 270.00, 14.5, 82, 96),
+    (1, NOW() - INTERVAL '1 day', NOW() - INTERVAL '1 day' + INTERVAL '30 minutes', 3, 4, 2, 1, NULL, 1, 12.9, 30, 410.00, 391.00, 16.0, 90, 110),
+    (1, NOW() - INTERVAL '3 hours', NOW() - INTERVAL '3 hours' + INTERVAL '20 minutes', 5, 6, 1, 2, 1, NULL, 12.2, 20, 391.00, 376.00, 18.5, 78, 88);
+
+INSERT INTO states (car_id, state, start_date, end_date) VALUES
+    (1, 'online', NOW() - INTERVAL '4 hours', NOW() - INTERVAL '3 hours'),
+    (1, 'asleep', NOW() - INTERVAL '2 hours', NULL);
+
+SELECT setval('positions_id_seq', (SELECT MAX(id) FROM positions));
+SELECT setval('addresses_id_seq', (SELECT MAX(id) FROM addresses));
+SELECT setval('geofences_id_seq', (SELECT MAX(id) FROM geofences));
+SELECT setval('charging_processes_id_seq', (SELECT MAX(id) FROM charging_processes));
+SELECT setval('cars_id_seq', (SELECT MAX(id) FROM cars));